@@ -4,86 +4,93 @@ Complete Harness Project Creation with Template References
 Creates: Project, Service, Environments, Infrastructures, Pipelines (from templates), User Groups, RBAC
 """
 
-import requests
 import yaml
 import json
 import logging
+import logging.handlers
 import argparse
+import asyncio
+import atexit
+import os
+import queue
 import sys
-from typing import Dict, List
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+if TYPE_CHECKING:
+    import requests
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-class HarnessCompleteAutomation:
-    def __init__(self, account_id: str, api_key: str, org_id: str, base_url: str = "https://app.harness.io"):
-        self.account_id = account_id
-        self.api_key = api_key
-        self.org_id = org_id
-        self.base_url = base_url
+def _configure_logging() -> None:
+    """Log through a queue so a background thread does the stderr writes
     
-    def _make_request(self, method: str, endpoint: str, payload: Dict = None, content_type: str = "application/json") -> Dict:
-        """Make API request to Harness"""
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Content-Type": content_type,
-            "x-api-key": self.api_key
-        }
-        
-        if content_type == "application/json":
-            response = requests.request(method, url, headers=headers, json=payload)
-        else:
-            response = requests.request(method, url, headers=headers, data=payload)
-        
-        response.raise_for_status()
-        return response.json()
+    Like logging.basicConfig, this leaves an already configured root logger alone.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
     
-    def create_project(self, project_name: str, project_id: str, description: str = "") -> Dict:
-        """Create a project"""
-        logger.info(f"Creating project: {project_name}")
-        
-        endpoint = (f"/ng/api/projects?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}")
-        
-        payload = {
-            "project": {
-                "identifier": project_id,
-                "name": project_name,
-                "description": description,
-                "tags": {"automation": "true"},
-                "color": "#0063F7",
-                "modules": ["CD", "CI"]
-            }
-        }
-        
-        try:
-            result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Project created: {project_name}")
-            return result
-        except Exception as e:
-            logger.error(f"✗ Failed to create project: {e}")
-            raise
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
     
-    def create_service(self, project_id: str, service_name: str, service_identifier: str, service_type: str = "Kubernetes") -> Dict:
-        """Create service"""
-        logger.info(f"Creating service: {service_name}")
-        
-        endpoint = (f"/ng/api/servicesV2?"
-                   f"accountIdentifier={self.account_id}")
-        
-        payload = {
-            "identifier": service_identifier,
-            "orgIdentifier": self.org_id,
-            "projectIdentifier": project_id,
-            "name": service_name,
-            "description": f"Service for {service_name}",
-            "tags": {"automation": "true"},
-            "yaml": f"""service:
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_configure_logging()
+
+ETAG_CACHE_FILE = ".harness_etag_cache.json"
+_BANNER = "=" * 80
+_SLUG_TABLE = str.maketrans({"-": "_", " ": "_"})
+
+
+def _slug(name: str) -> str:
+    """Normalize a name into a Harness identifier (lowercase, underscores)"""
+    return name.lower().translate(_SLUG_TABLE)
+
+
+def _log_error_response(error: Exception) -> None:
+    """Log the Harness response body carried by a failed request, if there is one"""
+    response = getattr(error, 'response', None)
+    if response is not None and response.text:
+        logger.error("Response: %s", response.text)
+
+
+@dataclass(frozen=True)
+class ResourceSpec:
+    """How to create one kind of Harness resource
+    
+    Endpoint templates are rendered with str.format_map against the fields passed
+    to HarnessCompleteAutomation.create, plus identifier, account_id, qs_org and
+    qs_proj (the account/org[/project] query strings).
+    """
+    label: str
+    name_field: str
+    endpoint_tmpl: str
+    get_endpoint_tmpl: str
+    identifier: Callable[[Dict], str]
+    payload: Callable[[Dict], Dict]
+    defaults: Dict = field(default_factory=dict)
+
+
+# Rendered with str.format_map against the create() fields of the resource
+_SERVICE_YAML_TMPL = """service:
   name: {service_name}
-  identifier: {service_identifier}
-  orgIdentifier: {self.org_id}
+  identifier: {identifier}
+  orgIdentifier: {org_id}
   projectIdentifier: {project_id}
   serviceDefinition:
     type: {service_type}
@@ -113,80 +120,22 @@ class HarnessCompleteAutomation:
                 imagePath: <+input>
                 tag: <+input>
 """
-        }
-        
-        try:
-            result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Service created: {service_name}")
-            return result
-        except Exception as e:
-            logger.error(f"✗ Failed to create service: {e}")
-            raise
-    
-    def create_environment(self, project_id: str, env_name: str, env_type: str = "PreProduction") -> Dict:
-        """Create environment"""
-        logger.info(f"Creating environment: {env_name}")
-        
-        endpoint = (f"/ng/api/environmentsV2?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
-        
-        env_identifier = env_name.lower().replace("-", "_")
-        
-        payload = {
-            "identifier": env_identifier,
-            "orgIdentifier": self.org_id,
-            "projectIdentifier": project_id,
-            "name": env_name,
-            "description": f"{env_name} environment",
-            "type": env_type,
-            "tags": {"automation": "true", "environment": env_name.lower()},
-            "yaml": f"""environment:
+
+_ENV_YAML_TMPL = """environment:
   name: {env_name}
-  identifier: {env_identifier}
-  orgIdentifier: {self.org_id}
+  identifier: {identifier}
+  orgIdentifier: {org_id}
   projectIdentifier: {project_id}
   type: {env_type}
   tags:
-    environment: {env_name.lower()}
+    environment: {env_tag}
   variables: []
 """
-        }
-        
-        try:
-            result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Environment created: {env_name}")
-            return result
-        except Exception as e:
-            logger.error(f"✗ Failed to create environment: {e}")
-            raise
-    
-    def create_infrastructure(self, project_id: str, env_id: str, infra_name: str, 
-                            connector_ref: str, namespace: str) -> Dict:
-        """Create infrastructure definition"""
-        logger.info(f"Creating infrastructure: {infra_name}")
-        
-        endpoint = (f"/ng/api/infrastructures?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
-        
-        infra_identifier = infra_name.lower().replace("-", "_")
-        
-        payload = {
-            "identifier": infra_identifier,
-            "orgIdentifier": self.org_id,
-            "projectIdentifier": project_id,
-            "environmentRef": env_id,
-            "name": infra_name,
-            "description": f"Infrastructure for {infra_name}",
-            "tags": {"automation": "true"},
-            "type": "KubernetesDirect",
-            "yaml": f"""infrastructureDefinition:
+
+_INFRA_YAML_TMPL = """infrastructureDefinition:
   name: {infra_name}
-  identifier: {infra_identifier}
-  orgIdentifier: {self.org_id}
+  identifier: {identifier}
+  orgIdentifier: {org_id}
   projectIdentifier: {project_id}
   environmentRef: {env_id}
   deploymentType: Kubernetes
@@ -197,21 +146,354 @@ class HarnessCompleteAutomation:
     releaseName: release-<+INFRA_KEY>
   allowSimultaneousDeployments: false
 """
+
+
+def _project_payload(f: Dict) -> Dict:
+    return {
+        "project": {
+            "identifier": f['identifier'],
+            "name": f['project_name'],
+            "description": f['description'],
+            "tags": {"automation": "true"},
+            "color": "#0063F7",
+            "modules": ["CD", "CI"]
         }
+    }
+
+
+def _service_payload(f: Dict) -> Dict:
+    return {
+        "identifier": f['identifier'],
+        "orgIdentifier": f['org_id'],
+        "projectIdentifier": f['project_id'],
+        "name": f['service_name'],
+        "description": f"Service for {f['service_name']}",
+        "tags": {"automation": "true"},
+        "yaml": _SERVICE_YAML_TMPL.format_map(f)
+    }
+
+
+def _environment_payload(f: Dict) -> Dict:
+    env_tag = f['env_name'].lower()
+    return {
+        "identifier": f['identifier'],
+        "orgIdentifier": f['org_id'],
+        "projectIdentifier": f['project_id'],
+        "name": f['env_name'],
+        "description": f"{f['env_name']} environment",
+        "type": f['env_type'],
+        "tags": {"automation": "true", "environment": env_tag},
+        "yaml": _ENV_YAML_TMPL.format_map({**f, 'env_tag': env_tag})
+    }
+
+
+def _infrastructure_payload(f: Dict) -> Dict:
+    return {
+        "identifier": f['identifier'],
+        "orgIdentifier": f['org_id'],
+        "projectIdentifier": f['project_id'],
+        "environmentRef": f['env_id'],
+        "name": f['infra_name'],
+        "description": f"Infrastructure for {f['infra_name']}",
+        "tags": {"automation": "true"},
+        "type": "KubernetesDirect",
+        "yaml": _INFRA_YAML_TMPL.format_map(f)
+    }
+
+
+def _user_group_payload(f: Dict) -> Dict:
+    return {
+        "identifier": f['identifier'],
+        "name": f['group_name'],
+        "description": f['description'],
+        "tags": {"automation": "true"},
+        "users": f['users'] or [],
+        "notificationConfigs": []
+    }
+
+
+_RESOURCE_SPECS: Dict[str, ResourceSpec] = {
+    'project': ResourceSpec(
+        label="Project",
+        name_field='project_name',
+        endpoint_tmpl="/ng/api/projects?{qs_org}",
+        get_endpoint_tmpl="/ng/api/projects/{identifier}?{qs_org}",
+        identifier=lambda f: f['project_id'],
+        payload=_project_payload,
+        defaults={'description': ""}
+    ),
+    'service': ResourceSpec(
+        label="Service",
+        name_field='service_name',
+        endpoint_tmpl="/ng/api/servicesV2?accountIdentifier={account_id}",
+        get_endpoint_tmpl="/ng/api/servicesV2/{identifier}?{qs_proj}",
+        identifier=lambda f: f['service_identifier'],
+        payload=_service_payload,
+        defaults={'service_type': "Kubernetes"}
+    ),
+    'environment': ResourceSpec(
+        label="Environment",
+        name_field='env_name',
+        endpoint_tmpl="/ng/api/environmentsV2?{qs_proj}",
+        get_endpoint_tmpl="/ng/api/environmentsV2/{identifier}?{qs_proj}",
+        identifier=lambda f: _slug(f['env_name']),
+        payload=_environment_payload,
+        defaults={'env_type': "PreProduction"}
+    ),
+    'infrastructure': ResourceSpec(
+        label="Infrastructure",
+        name_field='infra_name',
+        endpoint_tmpl="/ng/api/infrastructures?{qs_proj}",
+        get_endpoint_tmpl="/ng/api/infrastructures/{identifier}?{qs_proj}&environmentIdentifier={env_id}",
+        identifier=lambda f: _slug(f['infra_name']),
+        payload=_infrastructure_payload
+    ),
+    'user_group': ResourceSpec(
+        label="User group",
+        name_field='group_name',
+        endpoint_tmpl="/ng/api/user-groups?{qs_proj}",
+        get_endpoint_tmpl="/ng/api/user-groups/{identifier}?{qs_proj}",
+        identifier=lambda f: f['group_id'],
+        payload=_user_group_payload,
+        defaults={'users': None}
+    )
+}
+
+
+def _resource_identifier(kind: str, fields: Dict) -> str:
+    """Identifier create() gives a resource of this kind, for reporting failures"""
+    spec = _RESOURCE_SPECS[kind]
+    return spec.identifier({**spec.defaults, **fields})
+
+
+class HarnessCompleteAutomation:
+    def __init__(self, account_id: str, api_key: str, org_id: str, base_url: str = "https://app.harness.io"):
+        self.account_id = account_id
+        self.api_key = api_key
+        self.org_id = org_id
+        self.base_url = base_url
+        self._qs_org = f"accountIdentifier={account_id}&orgIdentifier={org_id}"
+        # Imported here so --dry-run never pays for loading requests
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+        
+        self.session = Session()
+        self.session.headers.update({"x-api-key": api_key})
+        # All traffic goes to one host; 8 keep-alive connections cover concurrent creates
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8, pool_block=False))
+        self._etag_cache: Dict[str, Dict] = self._load_etag_cache()
+        self._completed: Dict[Tuple[str, str], Dict] = {}
+        self._checkpoint = None
+        # Creates run concurrently on worker threads; checkpoint lines must not interleave
+        self._checkpoint_lock = threading.Lock()
+    
+    def _make_request(self, method: str, endpoint: str, payload: Dict = None, content_type: str = "application/json",
+                      cache_key: Optional[str] = None) -> Dict:
+        """Make API request to Harness
+        
+        cache_key is the GET endpoint of the resource being created. When set, the
+        created resource is remembered in the ETag cache so later runs can find it
+        with _get_existing instead of POSTing it again.
+        """
+        url = f"{self.base_url}{endpoint}"
+        headers = {"Content-Type": content_type}
+        
+        if content_type == "application/json" and payload is not None:
+            # Encode once, compactly; requests' json= adds ", "/": " padding to every item
+            payload = json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+        
+        response = self.session.request(method, url, headers=headers, data=payload)
+        
+        response.raise_for_status()
+        result = self._decode(response)
+        if cache_key is not None:
+            self._etag_cache[self._etag_key(cache_key)] = {'etag': None, 'body': result}
+        return result
+    
+    @staticmethod
+    def _decode(response: "requests.Response") -> Dict:
+        """Decode a Harness response body
+        
+        Always returns a dict: empty bodies (204 No Content, Content-Length: 0)
+        short-circuit to {}, anything else is parsed straight from the raw bytes.
+        """
+        if not response.content:
+            return {}
+        return json.loads(response.content)
+    
+    def _etag_key(self, get_endpoint: str) -> str:
+        """ETag cache key for a GET endpoint; the full URL, so one cache file can serve several Harness hosts"""
+        return f"{self.base_url}{get_endpoint}"
+    
+    def _get_existing(self, get_endpoint: str) -> Optional[Dict]:
+        """Return a resource created by an earlier run if it still exists in Harness
+        
+        Only a 404 drops the cache entry; any other error is raised rather than
+        risking a duplicate POST on a transient 401/429/5xx.
+        """
+        key = self._etag_key(get_endpoint)
+        cached = self._etag_cache.get(key)
+        if cached is None:
+            return None
+        
+        headers = {"If-None-Match": cached['etag']} if cached.get('etag') else {}
+        response = self.session.get(key, headers=headers)
+        
+        if response.status_code == 304:
+            result = cached['body']
+        elif response.status_code == 200:
+            result = self._decode(response)
+            self._etag_cache[key] = {'etag': response.headers.get('ETag'), 'body': result}
+        elif response.status_code == 404:
+            del self._etag_cache[key]
+            return None
+        else:
+            response.raise_for_status()
+            return None
+        
+        logger.info("↺ Already exists, skipping create: %s", get_endpoint.split('?')[0])
+        return result
+    
+    @staticmethod
+    def _load_etag_cache() -> Dict[str, Dict]:
+        """Load the ETag cache written by a previous run"""
+        try:
+            with open(ETAG_CACHE_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_etag_cache(self) -> None:
+        """Persist the ETag cache so reruns can skip resources that already exist"""
+        # Merge with what other instances (other accounts/orgs) saved meanwhile
+        etag_cache = self._load_etag_cache()
+        etag_cache.update(self._etag_cache)
+        with open(ETAG_CACHE_FILE, 'w') as f:
+            json.dump(etag_cache, f)
+    
+    def start_checkpoint(self, checkpoint_file: str) -> None:
+        """Record created resources to checkpoint_file, rechecking any a previous run recorded there"""
+        self._close_checkpoint()
+        self._completed = self._load_checkpoint(checkpoint_file)
+        self._checkpoint = open(checkpoint_file, 'a')
+    
+    def discard_checkpoint(self) -> None:
+        """Close and delete the checkpoint log once a run has created everything"""
+        if self._checkpoint is not None:
+            checkpoint_file = self._checkpoint.name
+            self._close_checkpoint()
+            os.remove(checkpoint_file)
+        self._completed = {}
+    
+    def _close_checkpoint(self) -> None:
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+            self._checkpoint = None
+    
+    @staticmethod
+    def _load_checkpoint(checkpoint_file: str) -> Dict[Tuple[str, str], Dict]:
+        """Load the resources recorded by a previous run's checkpoint log"""
+        completed = {}
+        try:
+            with open(checkpoint_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Line truncated by a crash mid-write
+                    completed[(record['kind'], record['id'])] = record['result']
+        except OSError:
+            pass
+        return completed
+    
+    def _record(self, kind: str, identifier: str, result: Dict) -> None:
+        """Append a created resource to the checkpoint log"""
+        line = json.dumps({'kind': kind, 'id': identifier, 'result': result}) + "\n"
+        with self._checkpoint_lock:
+            self._completed[(kind, identifier)] = result
+            if self._checkpoint is not None:
+                self._checkpoint.write(line)
+                self._checkpoint.flush()
+    
+    def _seed_from_checkpoint(self, kind: str, identifier: str, get_endpoint: str) -> None:
+        """Queue a resource checkpointed by an earlier run for the existence check
+        
+        The resource may have been deleted since, so the checkpoint is not trusted
+        outright: its GET endpoint goes through _get_existing like an ETag cache entry.
+        """
+        key = self._etag_key(get_endpoint)
+        result = self._completed.get((kind, identifier))
+        if result is not None and key not in self._etag_cache:
+            self._etag_cache[key] = {'etag': None, 'body': result}
+    
+    def close(self) -> None:
+        """Persist the ETag cache, close the checkpoint log and release pooled connections"""
+        self.save_etag_cache()
+        self._close_checkpoint()
+        self.session.close()
+    
+    def _fields(self, spec: ResourceSpec, fields: Dict) -> Dict:
+        """Complete caller fields with defaults, identifier and query strings for a spec"""
+        f = {**spec.defaults, **fields, 'org_id': self.org_id, 'account_id': self.account_id}
+        f['identifier'] = spec.identifier(f)
+        f['qs_org'] = self._qs_org
+        f['qs_proj'] = f"{self._qs_org}&projectIdentifier={f['project_id']}"
+        return f
+    
+    def create(self, kind: str, **fields) -> Dict:
+        """Create a Harness resource of the given kind (a key of _RESOURCE_SPECS)"""
+        spec = _RESOURCE_SPECS[kind]
+        f = self._fields(spec, fields)
+        name = f[spec.name_field]
+        
+        get_endpoint = spec.get_endpoint_tmpl.format_map(f)
+        self._seed_from_checkpoint(kind, f['identifier'], get_endpoint)
         
         try:
-            result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Infrastructure created: {infra_name}")
+            result = self._get_existing(get_endpoint)
+            if result is None:
+                logger.info("Creating %s: %s", spec.label.lower(), name)
+                result = self._make_request("POST", spec.endpoint_tmpl.format_map(f), spec.payload(f),
+                                            cache_key=get_endpoint)
+                logger.info("✓ %s created: %s", spec.label, name)
+            self._record(kind, f['identifier'], result)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create infrastructure: {e}")
+            logger.error("✗ Failed to create %s: %s", spec.label.lower(), e)
             raise
     
+    def create_project(self, project_name: str, project_id: str, description: str = "") -> Dict:
+        """Create a project"""
+        return self.create('project', project_name=project_name, project_id=project_id, description=description)
+    
+    def create_service(self, project_id: str, service_name: str, service_identifier: str, service_type: str = "Kubernetes") -> Dict:
+        """Create service"""
+        return self.create('service', project_id=project_id, service_name=service_name,
+                           service_identifier=service_identifier, service_type=service_type)
+    
+    def create_environment(self, project_id: str, env_name: str, env_type: str = "PreProduction") -> Dict:
+        """Create environment"""
+        return self.create('environment', project_id=project_id, env_name=env_name, env_type=env_type)
+    
+    def create_infrastructure(self, project_id: str, env_id: str, infra_name: str, 
+                            connector_ref: str, namespace: str) -> Dict:
+        """Create infrastructure definition"""
+        return self.create('infrastructure', project_id=project_id, env_id=env_id, infra_name=infra_name,
+                           connector_ref=connector_ref, namespace=namespace)
+    
     def create_pipeline_from_template(self, project_id: str, pipeline_name: str,
                                      pipeline_identifier: str, template_ref: str,
                                      template_version: str = "v1") -> Dict:
         """Create a pipeline that references an org-level template"""
-        logger.info(f"Creating pipeline from template: {pipeline_name}")
+        get_endpoint = (f"/pipeline/api/pipelines/{pipeline_identifier}?"
+                        f"{self._qs_org}&projectIdentifier={project_id}")
+        self._seed_from_checkpoint('pipeline', pipeline_identifier, get_endpoint)
+        existing = self._get_existing(get_endpoint)
+        if existing is not None:
+            self._record('pipeline', pipeline_identifier, existing)
+            return existing
+        
+        logger.info("Creating pipeline from template: %s", pipeline_name)
         
         pipeline_yaml = {
             'pipeline': {
@@ -236,54 +518,106 @@ class HarnessCompleteAutomation:
         
         try:
             url = f"{self.base_url}{endpoint}"
-            headers = {
-                "Content-Type": "application/yaml",
-                "x-api-key": self.api_key
-            }
+            headers = {"Content-Type": "application/yaml"}
             
-            response = requests.post(url, headers=headers, data=pipeline_yaml_str)
+            response = self.session.post(url, headers=headers, data=pipeline_yaml_str.encode())
             response.raise_for_status()
             
-            logger.info(f"✓ Pipeline created from template: {pipeline_name}")
-            return response.json()
+            logger.info("✓ Pipeline created from template: %s", pipeline_name)
+            result = self._decode(response)
+            self._record('pipeline', pipeline_identifier, result)
+            return result
         except Exception as e:
-            logger.error(f"✗ Failed to create pipeline: {e}")
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+            logger.error("✗ Failed to create pipeline: %s", e)
+            _log_error_response(e)
             raise
     
     def create_user_group(self, project_id: str, group_name: str, group_id: str,
                          description: str, users: List[str] = None) -> Dict:
         """Create user group"""
-        logger.info(f"Creating user group: {group_name}")
-        
-        endpoint = (f"/ng/api/user-groups?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
-        
-        payload = {
-            "identifier": group_id,
-            "name": group_name,
-            "description": description,
-            "tags": {"automation": "true"},
-            "users": users or [],
-            "notificationConfigs": []
-        }
-        
+        return self.create('user_group', project_id=project_id, group_name=group_name, group_id=group_id,
+                           description=description, users=users)
+
+@lru_cache(maxsize=8)
+def get_automation(account_id: str, api_key: str, org_id: str,
+                   base_url: str = "https://app.harness.io") -> HarnessCompleteAutomation:
+    """Return the shared automation instance for an account/key/org/base URL
+    
+    Orchestrators creating several projects back-to-back reuse one pooled
+    Session and ETag cache this way; the instance is closed at process exit.
+    """
+    automation = HarnessCompleteAutomation(account_id, api_key, org_id, base_url)
+    atexit.register(automation.close)
+    return automation
+
+
+def run_create_step(automation: HarnessCompleteAutomation, title: str, kind: str, spec: Dict) -> Dict:
+    """Create one resource as a setup step, returning its Harness response or raising if it failed"""
+    logger.info("\n%s", _BANNER)
+    logger.info(title)
+    logger.info(_BANNER)
+    
+    try:
+        return automation.create(kind, **spec)
+    except Exception as e:
+        raise RuntimeError(f"Failed to create {kind.replace('_', ' ')}: {_resource_identifier(kind, spec)}") from e
+
+
+async def create_project_resources(automation: HarnessCompleteAutomation, service: Dict,
+                                   environments: Dict[str, Dict], infrastructures: Dict[str, Dict],
+                                   user_groups: Dict[str, Dict], pipelines: Dict[str, Dict]) -> Dict:
+    """Create everything that hangs off an existing project as concurrent tasks
+    
+    Every resource gets its own task, with the blocking create running on a worker
+    thread. Only an infrastructure waits, and only for the task creating its own
+    environment. All tasks run to completion; a RuntimeError listing the failures
+    is raised afterwards. Otherwise the Harness responses are returned under the
+    same keys as the specs, in the layout of the results file.
+    """
+    failed = []
+    
+    async def create(kind: str, spec: Dict, after: Optional[asyncio.Task] = None) -> Optional[Dict]:
+        # Skip an infrastructure whose environment failed; create() has already logged errors
+        if after is None or await after is not None:
+            try:
+                return await asyncio.to_thread(automation.create, kind, **spec)
+            except Exception:
+                pass
+        failed.append(_resource_identifier(kind, spec))
+        return None
+    
+    async def create_pipeline(spec: Dict) -> Optional[Dict]:
         try:
-            result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ User group created: {group_name}")
-            return result
-        except Exception as e:
-            logger.error(f"✗ Failed to create user group: {e}")
-            raise
+            return await asyncio.to_thread(automation.create_pipeline_from_template, **spec)
+        except Exception:
+            failed.append(spec['pipeline_identifier'])
+            return None
+    
+    env_tasks = {key: asyncio.create_task(create('environment', spec)) for key, spec in environments.items()}
+    env_tasks_by_id = {_slug(environments[key]['env_name']): task for key, task in env_tasks.items()}
+    service_task = asyncio.create_task(create('service', service))
+    pipeline_tasks = {key: asyncio.create_task(create_pipeline(spec)) for key, spec in pipelines.items()}
+    user_group_tasks = {key: asyncio.create_task(create('user_group', spec)) for key, spec in user_groups.items()}
+    infra_tasks = {key: asyncio.create_task(create('infrastructure', spec, after=env_tasks_by_id.get(spec['env_id'])))
+                   for key, spec in infrastructures.items()}
+    await asyncio.gather(*env_tasks.values(), service_task, *pipeline_tasks.values(),
+                         *user_group_tasks.values(), *infra_tasks.values())
+    
+    if failed:
+        raise RuntimeError(f"Failed to create: {', '.join(failed)}")
+    return {
+        'service': service_task.result(),
+        'environments': {key: task.result() for key, task in env_tasks.items()},
+        'infrastructures': {key: task.result() for key, task in infra_tasks.items()},
+        'pipelines': {key: task.result() for key, task in pipeline_tasks.items()},
+        'user_groups': {key: task.result() for key, task in user_group_tasks.items()}
+    }
 
 
 def load_config_from_file(config_path: str) -> Dict:
     """Load configuration from YAML file"""
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def main():
@@ -302,101 +636,40 @@ def main():
     org_id = config['harness']['org_id']
     base_url = config['harness'].get('base_url', "https://app.harness.io")
     project_name = config['project']['repo_name']
-    project_id = project_name.lower().replace('-', '_')
+    project_id = _slug(project_name)
     
     if args.dry_run:
         logger.info("DRY RUN MODE")
-        logger.info(f"Would create project: {project_name}")
-        logger.info(f"Using templates:")
+        logger.info("Would create project: %s", project_name)
+        logger.info("Using templates:")
         
         # Check both templates and pipelines sections for compatibility
         # This makes it work with both the old script format and your Jenkins config
         if 'templates' in config:
-            logger.info(f"  - NonProd: {config.get('templates', {}).get('nonprod', {}).get('template_ref', 'N/A')}")
-            logger.info(f"  - Prod: {config.get('templates', {}).get('prod', {}).get('template_ref', 'N/A')}")
+            logger.info("  - NonProd: %s", config.get('templates', {}).get('nonprod', {}).get('template_ref', 'N/A'))
+            logger.info("  - Prod: %s", config.get('templates', {}).get('prod', {}).get('template_ref', 'N/A'))
         elif 'pipelines' in config:
-            logger.info(f"  - NonProd: {config.get('pipelines', {}).get('nonprod', {}).get('template_ref', 'N/A')}")
-            logger.info(f"  - Prod: {config.get('pipelines', {}).get('prod', {}).get('template_ref', 'N/A')}")
+            logger.info("  - NonProd: %s", config.get('pipelines', {}).get('nonprod', {}).get('template_ref', 'N/A'))
+            logger.info("  - Prod: %s", config.get('pipelines', {}).get('prod', {}).get('template_ref', 'N/A'))
         return
     
-    automation = HarnessCompleteAutomation(
+    automation = get_automation(
         account_id=account_id,
         api_key=api_key,
         org_id=org_id,
         base_url=base_url
     )
+    automation.start_checkpoint(f"complete_setup_results_{project_id}.jsonl")
     
     try:
         results = {}
+        cluster_connector = config.get('connectors', {}).get('cluster_connector', '<+input>')
         
         # Step 1: Create Project
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 1: Creating Project")
-        logger.info("=" * 80)
-        
-        project = automation.create_project(
-            project_name=project_name,
-            project_id=project_id,
-            description=config['project'].get('description', '')
-        )
-        results['project'] = project
-        
-        # Step 2: Create Service
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 2: Creating Service")
-        logger.info("=" * 80)
-        
-        service = automation.create_service(
-            project_id=project_id,
-            service_name=f"{project_name} Service",
-            service_identifier=f"{project_id}_service"
-        )
-        results['service'] = service
-        
-        # Step 3: Create Environments
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 3: Creating Environments")
-        logger.info("=" * 80)
-        
-        staging_env = automation.create_environment(
-            project_id=project_id,
-            env_name="staging",
-            env_type="PreProduction"
-        )
-        
-        prod_env = automation.create_environment(
-            project_id=project_id,
-            env_name="production",
-            env_type="Production"
-        )
-        results['environments'] = {'staging': staging_env, 'production': prod_env}
-        
-        # Step 4: Create Infrastructures
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 4: Creating Infrastructures")
-        logger.info("=" * 80)
-        
-        staging_infra = automation.create_infrastructure(
-            project_id=project_id,
-            env_id="staging",
-            infra_name="staging_infra",
-            connector_ref=config.get('connectors', {}).get('cluster_connector', '<+input>'),
-            namespace=f"{project_name}-staging"
-        )
-        
-        prod_infra = automation.create_infrastructure(
-            project_id=project_id,
-            env_id="production",
-            infra_name="prod_infra_primary",
-            connector_ref=config.get('connectors', {}).get('cluster_connector', '<+input>'),
-            namespace=f"{project_name}-prod"
-        )
-        results['infrastructures'] = {'staging': staging_infra, 'production': prod_infra}
-        
-        # Step 5: Create Pipelines from Templates
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 5: Creating Pipelines from Templates")
-        logger.info("=" * 80)
+        results['project'] = run_create_step(automation, "STEP 1: Creating Project", 'project', {
+            'project_name': project_name, 'project_id': project_id,
+            'description': config['project'].get('description', '')
+        })
         
         # FIXED: Check both templates and pipelines sections for backward compatibility
         # This makes it work with both the old script format and the Jenkins config
@@ -416,86 +689,93 @@ def main():
             
             prod_template_ref = prod_template_config.get('template_ref', 'prod_deployment_pipeline')
             prod_version = prod_template_config.get('version', 'v1')
-            
-        logger.info(f"Using NonProd Template: {nonprod_template_ref} (version {nonprod_version})")
-        logger.info(f"Using Prod Template: {prod_template_ref} (version {prod_version})")
-        
-        nonprod_pipeline = automation.create_pipeline_from_template(
-            project_id=project_id,
-            pipeline_name=f"{project_name} NonProd Pipeline",
-            pipeline_identifier=f"{project_id}_nonprod_pipeline",
-            template_ref=nonprod_template_ref,
-            template_version=nonprod_version
-        )
-        
-        prod_pipeline = automation.create_pipeline_from_template(
-            project_id=project_id,
-            pipeline_name=f"{project_name} Prod Pipeline",
-            pipeline_identifier=f"{project_id}_prod_pipeline",
-            template_ref=prod_template_ref,
-            template_version=prod_version
-        )
-        results['pipelines'] = {'nonprod': nonprod_pipeline, 'prod': prod_pipeline}
         
-        # Step 6: Create User Groups
+        user_groups = {}
         if config.get('features', {}).get('create_rbac', True):
-            logger.info("\n" + "=" * 80)
-            logger.info("STEP 6: Creating User Groups")
-            logger.info("=" * 80)
-            
-            developers_group = automation.create_user_group(
-                project_id=project_id,
-                group_name=f"{project_name} Developers",
-                group_id=f"{project_id}_developers",
-                description="Development team members",
-                users=config.get('users', {}).get('developers', [])
-            )
-            
-            approvers_group = automation.create_user_group(
-                project_id=project_id,
-                group_name=f"{project_name} Production Approvers",
-                group_id=f"{project_id}_prod_approvers",
-                description="Production approvers",
-                users=config.get('users', {}).get('approvers', [])
-            )
-            
-            operators_group = automation.create_user_group(
-                project_id=project_id,
-                group_name=f"{project_name} Operators",
-                group_id=f"{project_id}_operators",
-                description="Operations team",
-                users=config.get('users', {}).get('operators', [])
-            )
-            
-            results['user_groups'] = {
-                'developers': developers_group,
-                'approvers': approvers_group,
-                'operators': operators_group
+            user_groups = {
+                'developers': {
+                    'project_id': project_id,
+                    'group_name': f"{project_name} Developers",
+                    'group_id': f"{project_id}_developers",
+                    'description': "Development team members",
+                    'users': config.get('users', {}).get('developers', [])
+                },
+                'approvers': {
+                    'project_id': project_id,
+                    'group_name': f"{project_name} Production Approvers",
+                    'group_id': f"{project_id}_prod_approvers",
+                    'description': "Production approvers",
+                    'users': config.get('users', {}).get('approvers', [])
+                },
+                'operators': {
+                    'project_id': project_id,
+                    'group_name': f"{project_name} Operators",
+                    'group_id': f"{project_id}_operators",
+                    'description': "Operations team",
+                    'users': config.get('users', {}).get('operators', [])
+                }
             }
         
+        # Steps 2-6: everything else only needs the project, so create it concurrently
+        logger.info("\n%s", _BANNER)
+        logger.info("STEPS 2-6: Creating Service, Environments, Infrastructures, Pipelines and User Groups")
+        logger.info(_BANNER)
+        logger.info("Using NonProd Template: %s (version %s)", nonprod_template_ref, nonprod_version)
+        logger.info("Using Prod Template: %s (version %s)", prod_template_ref, prod_version)
+        
+        results.update(asyncio.run(create_project_resources(
+            automation,
+            service={'project_id': project_id, 'service_name': f"{project_name} Service",
+                     'service_identifier': f"{project_id}_service"},
+            environments={
+                'staging': {'project_id': project_id, 'env_name': "staging", 'env_type': "PreProduction"},
+                'production': {'project_id': project_id, 'env_name': "production", 'env_type': "Production"}
+            },
+            infrastructures={
+                'staging': {'project_id': project_id, 'env_id': "staging", 'infra_name': "staging_infra",
+                            'connector_ref': cluster_connector, 'namespace': f"{project_name}-staging"},
+                'production': {'project_id': project_id, 'env_id': "production", 'infra_name': "prod_infra_primary",
+                               'connector_ref': cluster_connector, 'namespace': f"{project_name}-prod"}
+            },
+            user_groups=user_groups,
+            pipelines={
+                'nonprod': {'project_id': project_id, 'pipeline_name': f"{project_name} NonProd Pipeline",
+                            'pipeline_identifier': f"{project_id}_nonprod_pipeline",
+                            'template_ref': nonprod_template_ref, 'template_version': nonprod_version},
+                'prod': {'project_id': project_id, 'pipeline_name': f"{project_name} Prod Pipeline",
+                         'pipeline_identifier': f"{project_id}_prod_pipeline",
+                         'template_ref': prod_template_ref, 'template_version': prod_version}
+            }
+        )))
+        if not user_groups:
+            del results['user_groups']
+        
         # Success summary
-        logger.info("\n" + "=" * 80)
+        logger.info("\n%s", _BANNER)
         logger.info("✅ SUCCESS - Complete Project Setup!")
-        logger.info("=" * 80)
-        logger.info(f"\nProject: {project_name}")
-        logger.info(f"  ✓ Service: {project_id}_service")
-        logger.info(f"  ✓ Environments: staging, production")
-        logger.info(f"  ✓ Infrastructures: staging_infra, prod_infra_primary")
-        logger.info(f"  ✓ Pipelines:")
-        logger.info(f"      - NonProd (uses template: {nonprod_template_ref} v{nonprod_version})")
-        logger.info(f"      - Prod (uses template: {prod_template_ref} v{prod_version})")
-        logger.info(f"  ✓ User Groups: 3")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
+        logger.info("\nProject: %s", project_name)
+        logger.info("  ✓ Service: %s_service", project_id)
+        logger.info("  ✓ Environments: staging, production")
+        logger.info("  ✓ Infrastructures: staging_infra, prod_infra_primary")
+        logger.info("  ✓ Pipelines:")
+        logger.info("      - NonProd (uses template: %s v%s)", nonprod_template_ref, nonprod_version)
+        logger.info("      - Prod (uses template: %s v%s)", prod_template_ref, prod_version)
+        logger.info("  ✓ User Groups: %d", len(user_groups))
+        logger.info(_BANNER)
         
         # Save results
         output_file = f"complete_setup_results_{project_id}.json"
         with open(output_file, 'w') as f:
             json.dump(results, f, indent=2)
         
-        logger.info(f"\n✓ Results saved to: {output_file}")
+        logger.info("\n✓ Results saved to: %s", output_file)
+        
+        # Everything exists now; a rerun must not start from this run's checkpoint
+        automation.discard_checkpoint()
         
     except Exception as e:
-        logger.error(f"\n✗ Setup failed: {e}")
+        logger.error("\n✗ Setup failed: %s", e)
         sys.exit(1)
 
 
@@ -5,16 +5,124 @@ Creates org-level pipeline templates, then projects/pipelines that use them
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import yaml
 import json
 import logging
 import argparse
+import asyncio
+import re
+import string
 import sys
-from typing import Dict, List
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Optional, Pattern, Tuple
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+# Log timestamps in UTC, which skips a localtime() conversion per record
+_log_handler.formatter.converter = time.gmtime
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 80
+# Harness identifiers are ASCII-only, so one translate pass can lowercase and map '-' -> '_'
+_PROJECT_ID_TABLE = str.maketrans({'-': '_', **{c: c.lower() for c in string.ascii_uppercase}})
+
+_PIPELINE_FROM_TEMPLATE_YAML = """pipeline:
+  name: {name}
+  identifier: {identifier}
+  projectIdentifier: {project_id}
+  orgIdentifier: {org_id}
+  tags:
+    created_from: template
+  template:
+    templateRef: {template_ref}
+    versionLabel: {version_label}
+"""
+
+# Harness calls in flight at once, to stay clear of its API rate limits
+MAX_CONCURRENT_REQUESTS = 4
+
+
+@lru_cache(maxsize=None)
+def _load_template_file(template_yaml_path: str) -> Dict:
+    """Parse a pipeline template file once per run
+    
+    The cached tree is shared, so it must never be mutated; _substitute_placeholders
+    returns a fresh copy.
+    """
+    with open(template_yaml_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _placeholder_pattern(placeholders: FrozenSet[str]) -> Pattern:
+    """Compile one alternation matching any placeholder
+    
+    Longer placeholders come first so compound ones (PROJECT_NAME_service) win over
+    their prefixes (PROJECT_NAME), the same precedence as replacing longest-first.
+    """
+    if not placeholders:
+        return re.compile(r"(?!)")  # Matches nothing
+    return re.compile("|".join(re.escape(p) for p in sorted(placeholders, key=len, reverse=True)))
+
+
+def _substitute_placeholders(node: Any, pattern: Pattern, values: Dict[str, str]) -> Any:
+    """Return a copy of a parsed YAML tree with placeholders replaced in every string"""
+    if isinstance(node, dict):
+        return {key: _substitute_placeholders(value, pattern, values) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_substitute_placeholders(item, pattern, values) for item in node]
+    if isinstance(node, str):
+        return pattern.sub(lambda m: values[m.group(0)], node)
+    return node
+
+
+def _render_template_yaml(template_yaml_path: str, replacements: Dict[str, str],
+                          template_name: str, template_identifier: str, org_id: str,
+                          version_label: str) -> str:
+    """Render the org-level template YAML for a pipeline template file"""
+    # Replace placeholders in a single pass; compound placeholders take precedence
+    values = {key: str(value) for key, value in replacements.items()}
+    pipeline_yaml = _substitute_placeholders(_load_template_file(template_yaml_path),
+                                             _placeholder_pattern(frozenset(values)), values)
+    pipeline_spec = pipeline_yaml['pipeline']
+    
+    # Remove project-specific fields (templates should be reusable)
+    fields_to_remove = ['name', 'identifier', 'projectIdentifier', 'orgIdentifier']
+    for field in fields_to_remove:
+        if field in pipeline_spec:
+            del pipeline_spec[field]
+    
+    # Create template YAML structure
+    template_yaml = {
+        'template': {
+            'name': template_name,
+            'identifier': template_identifier,
+            'versionLabel': version_label,
+            'type': 'Pipeline',
+            'orgIdentifier': org_id,
+            'tags': {'automation': 'true'},
+            'spec': pipeline_spec
+        }
+    }
+    
+    return yaml.dump(template_yaml, default_flow_style=False, sort_keys=False, Dumper=SafeDumper)
+
+
+def _log_error_response(error: requests.exceptions.RequestException) -> None:
+    """Log the Harness response body carried by a failed request, if there is one"""
+    response = getattr(error, 'response', None)
+    if response is not None and response.text:
+        logger.error("Response: %s", response.text)
+
 
 class HarnessTemplateAutomation:
     def __init__(self, account_id: str, api_key: str, org_id: str):
@@ -22,62 +130,53 @@ class HarnessTemplateAutomation:
         self.api_key = api_key
         self.org_id = org_id
         self.base_url = "https://app.harness.io"
+        
+        # One pooled session keeps the TLS connection to Harness alive across calls.
+        # Transient errors are retried here for idempotent calls only: a create POST
+        # that went through behind a 502/504 would come back as "already exists",
+        # which projects have no update path for.
+        retry = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset(["GET", "PUT"]), raise_on_status=False)
+        self.session = requests.Session()
+        self.session.headers.update({"x-api-key": api_key})
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
     
     def _make_request(self, method: str, endpoint: str, payload: Dict = None, content_type: str = "application/json") -> Dict:
         """Make API request to Harness"""
         url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Content-Type": content_type,
-            "x-api-key": self.api_key
-        }
+        headers = {"Content-Type": content_type}
         
         if content_type == "application/json":
-            response = requests.request(method, url, headers=headers, json=payload)
+            response = self.session.request(method, url, headers=headers, json=payload)
         else:
-            response = requests.request(method, url, headers=headers, data=payload)
+            response = self.session.request(method, url, headers=headers, data=payload)
         
         response.raise_for_status()
-        return response.json()
+        return self._decode(response)
+    
+    @staticmethod
+    def _decode(response: requests.Response) -> Dict:
+        """Decode a Harness response body
+        
+        Parses the raw bytes directly (json detects UTF-8 itself), skipping the
+        charset detection and str decode that Response.json() goes through.
+        Empty bodies decode to {}.
+        """
+        if not response.content:
+            return {}
+        return json.loads(response.content)
     
     def create_org_level_pipeline_template(self, template_name: str, template_identifier: str,
                                           template_yaml_path: str, replacements: Dict[str, str],
                                           version_label: str = "v1") -> Dict:
         """Create a pipeline template at org level"""
-        logger.info(f"Creating org-level template: {template_name}")
-        
-        # Read and process template
-        with open(template_yaml_path, 'r') as f:
-            content = f.read()
-        
-        # Replace placeholders - do compound replacements first!
-        # Sort by length descending to replace longer strings first
-        sorted_replacements = sorted(replacements.items(), key=lambda x: len(x[0]), reverse=True)
-        for key, value in sorted_replacements:
-            content = content.replace(key, str(value))
-        
-        pipeline_yaml = yaml.safe_load(content)
-        pipeline_spec = pipeline_yaml['pipeline']
-        
-        # Remove project-specific fields (templates should be reusable)
-        fields_to_remove = ['name', 'identifier', 'projectIdentifier', 'orgIdentifier']
-        for field in fields_to_remove:
-            if field in pipeline_spec:
-                del pipeline_spec[field]
-        
-        # Create template YAML structure
-        template_yaml = {
-            'template': {
-                'name': template_name,
-                'identifier': template_identifier,
-                'versionLabel': version_label,
-                'type': 'Pipeline',
-                'orgIdentifier': self.org_id,
-                'tags': {'automation': 'true'},
-                'spec': pipeline_spec
-            }
-        }
-        
-        template_yaml_str = yaml.dump(template_yaml, default_flow_style=False, sort_keys=False)
+        template_yaml_str = _render_template_yaml(
+            template_yaml_path, replacements, template_name, template_identifier, self.org_id, version_label
+        )
         
         endpoint = (f"/template/api/templates?"
                    f"accountIdentifier={self.account_id}&"
@@ -85,69 +184,62 @@ class HarnessTemplateAutomation:
         
         try:
             url = f"{self.base_url}{endpoint}"
-            headers = {
-                "Content-Type": "application/yaml",
-                "x-api-key": self.api_key
-            }
+            headers = {"Content-Type": "application/yaml"}
             
             # Try to create
-            response = requests.post(url, headers=headers, data=template_yaml_str)
+            response = self.session.post(url, headers=headers, data=template_yaml_str)
             response.raise_for_status()
             
-            logger.info(f"✓ Org-level template created: {template_name} (version {version_label})")
-            return response.json()
+            logger.info("✓ Org-level template created: %s (version %s)", template_name, version_label)
+            return self._decode(response)
         except requests.exceptions.HTTPError as e:
             # If template already exists, try to update it
             if e.response.status_code == 400 and 'already exists' in e.response.text:
-                logger.info(f"⚠ Template already exists, updating: {template_name}")
-                try:
-                    # Use PUT to update
-                    update_endpoint = (f"/template/api/templates/{template_identifier}?"
-                                     f"accountIdentifier={self.account_id}&"
-                                     f"orgIdentifier={self.org_id}")
-                    update_url = f"{self.base_url}{update_endpoint}"
-                    response = requests.put(update_url, headers=headers, data=template_yaml_str)
-                    response.raise_for_status()
-                    logger.info(f"✓ Template updated: {template_name} (version {version_label})")
-                    return response.json()
-                except Exception as update_error:
-                    logger.error(f"✗ Failed to update template: {update_error}")
-                    if hasattr(update_error, 'response') and hasattr(update_error.response, 'text'):
-                        logger.error(f"Response: {update_error.response.text}")
-                    raise
+                logger.info("⚠ Template already exists, updating: %s", template_name)
+                return self._update_org_level_pipeline_template(template_name, template_identifier,
+                                                                template_yaml_str, version_label)
             else:
-                logger.error(f"✗ Failed to create template: {e}")
-                if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                    logger.error(f"Response: {e.response.text}")
+                logger.error("✗ Failed to create template: %s", e)
+                _log_error_response(e)
                 raise
-        except Exception as e:
-            logger.error(f"✗ Failed to create template: {e}")
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+        except requests.exceptions.RequestException as e:
+            logger.error("✗ Failed to create template: %s", e)
+            _log_error_response(e)
+            raise
+    
+    def _update_org_level_pipeline_template(self, template_name: str, template_identifier: str,
+                                            template_yaml_str: str, version_label: str) -> Dict:
+        """Update an existing org-level template in place"""
+        try:
+            # Use PUT to update
+            update_endpoint = (f"/template/api/templates/{template_identifier}?"
+                             f"accountIdentifier={self.account_id}&"
+                             f"orgIdentifier={self.org_id}")
+            update_url = f"{self.base_url}{update_endpoint}"
+            headers = {"Content-Type": "application/yaml"}
+            response = self.session.put(update_url, headers=headers, data=template_yaml_str)
+            response.raise_for_status()
+            logger.info("✓ Template updated: %s (version %s)", template_name, version_label)
+            return self._decode(response)
+        except requests.exceptions.RequestException as update_error:
+            logger.error("✗ Failed to update template: %s", update_error)
+            _log_error_response(update_error)
             raise
     
     def create_pipeline_from_template(self, project_id: str, pipeline_name: str,
                                      pipeline_identifier: str, template_ref: str,
                                      template_version: str = "v1") -> Dict:
         """Create a pipeline that references an org-level template"""
-        logger.info(f"Creating pipeline from template: {pipeline_name}")
-        
-        # Pipeline YAML that references the template
-        pipeline_yaml = {
-            'pipeline': {
-                'name': pipeline_name,
-                'identifier': pipeline_identifier,
-                'projectIdentifier': project_id,
-                'orgIdentifier': self.org_id,
-                'tags': {'created_from': 'template'},
-                'template': {
-                    'templateRef': f'org.{template_ref}',
-                    'versionLabel': template_version
-                }
-            }
-        }
-        
-        pipeline_yaml_str = yaml.dump(pipeline_yaml, default_flow_style=False, sort_keys=False)
+        # Pipeline YAML that references the template. The shape is fixed, so fill a
+        # string template; JSON-quoted values are valid YAML double-quoted scalars.
+        pipeline_yaml_str = _PIPELINE_FROM_TEMPLATE_YAML.format(
+            name=json.dumps(pipeline_name),
+            identifier=json.dumps(pipeline_identifier),
+            project_id=json.dumps(project_id),
+            org_id=json.dumps(self.org_id),
+            template_ref=json.dumps(f'org.{template_ref}'),
+            version_label=json.dumps(template_version)
+        )
         
         endpoint = (f"/pipeline/api/pipelines/v2?"
                    f"accountIdentifier={self.account_id}&"
@@ -156,26 +248,42 @@ class HarnessTemplateAutomation:
         
         try:
             url = f"{self.base_url}{endpoint}"
-            headers = {
-                "Content-Type": "application/yaml",
-                "x-api-key": self.api_key
-            }
+            headers = {"Content-Type": "application/yaml"}
             
-            response = requests.post(url, headers=headers, data=pipeline_yaml_str)
+            response = self.session.post(url, headers=headers, data=pipeline_yaml_str)
             response.raise_for_status()
             
-            logger.info(f"✓ Pipeline created from template: {pipeline_name}")
-            return response.json()
-        except Exception as e:
-            logger.error(f"✗ Failed to create pipeline: {e}")
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+            logger.info("✓ Pipeline created from template: %s", pipeline_name)
+            return self._decode(response)
+        except requests.exceptions.HTTPError as e:
+            # If pipeline already exists (e.g. a rerun), update it instead
+            if e.response.status_code == 400 and 'already exists' in e.response.text:
+                logger.info("⚠ Pipeline already exists, updating: %s", pipeline_name)
+                try:
+                    update_endpoint = (f"/pipeline/api/pipelines/v2/{pipeline_identifier}?"
+                                     f"accountIdentifier={self.account_id}&"
+                                     f"orgIdentifier={self.org_id}&"
+                                     f"projectIdentifier={project_id}")
+                    update_url = f"{self.base_url}{update_endpoint}"
+                    response = self.session.put(update_url, headers=headers, data=pipeline_yaml_str)
+                    response.raise_for_status()
+                    logger.info("✓ Pipeline updated: %s", pipeline_name)
+                    return self._decode(response)
+                except requests.exceptions.RequestException as update_error:
+                    logger.error("✗ Failed to update pipeline: %s", update_error)
+                    _log_error_response(update_error)
+                    raise
+            else:
+                logger.error("✗ Failed to create pipeline: %s", e)
+                _log_error_response(e)
+                raise
+        except requests.exceptions.RequestException as e:
+            logger.error("✗ Failed to create pipeline: %s", e)
+            _log_error_response(e)
             raise
     
     def create_project(self, project_name: str, project_id: str, description: str = "") -> Dict:
         """Create a project"""
-        logger.info(f"Creating project: {project_name}")
-        
         endpoint = (f"/ng/api/projects?"
                    f"accountIdentifier={self.account_id}&"
                    f"orgIdentifier={self.org_id}")
@@ -193,27 +301,209 @@ class HarnessTemplateAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Project created: {project_name}")
+            logger.info("✓ Project created: %s", project_name)
             return result
-        except Exception as e:
-            logger.error(f"✗ Failed to create project: {e}")
+        except requests.exceptions.RequestException as e:
+            logger.error("✗ Failed to create project: %s", e)
             raise
 
 
 def load_config_from_file(config_path: str) -> Dict:
-    """Load configuration from YAML file"""
+    """Load configuration from a YAML file, or a JSON file (.json) generated by CI"""
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        if config_path.endswith('.json'):
+            return json.load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+async def _call(semaphore: asyncio.Semaphore, func: Callable[..., Dict], **kwargs) -> Dict:
+    """Run one blocking Harness call on a worker thread, bounded by the shared semaphore"""
+    async with semaphore:
+        return await asyncio.to_thread(func, **kwargs)
+
+
+async def create_org_templates(automation: HarnessTemplateAutomation, semaphore: asyncio.Semaphore) -> Tuple[Dict, str]:
+    """Create (or update) both org-level pipeline templates under a fresh version label
+    
+    Returns the template results and the version label pipelines should reference.
+    """
+    org_id = automation.org_id
+    
+    logger.info("\n%s", _BANNER)
+    logger.info("STEP 1: Creating Org-Level Pipeline Templates")
+    logger.info(_BANNER)
+    
+    # Generic replacements for template (no project-specific values)
+    # Use <+input> for anything that varies by project
+    template_replacements = {
+        'PROJECT_NAME': '<+input>',
+        'PROJECT_IDENTIFIER': '<+input>',
+        'ORG_IDENTIFIER': org_id,
+        'CLUSTER_CONNECTOR_REF': '<+input>',
+        'DOCKER_CONNECTOR_REF': '<+input>',
+        'DOCKER_REGISTRY_CONNECTOR_REF': '<+input>',
+        'DOCKER_REGISTRY': 'docker.io',
+        'GIT_CONNECTOR_REF': '<+input>',
+        'REPO_NAME': '<+input>',
+        'SLACK_WEBHOOK_URL': '<+input>',
+        'PROJECT_IDENTIFIER_prod_approvers': '<+input>',
+        'PROJECT_IDENTIFIER_developers': '<+input>',
+        'PROJECT_IDENTIFIER_operators': '<+input>',
+        'PROJECT_NAME_service': '<+input>'
+    }
+    
+    import os
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    templates_dir = os.path.join(os.path.dirname(script_dir), 'templates')
+    
+    template_version = f"v{int(time.time())}"  # Use timestamp for unique version
+    logger.info("Using version label: %s", template_version)
+    
+    # The two templates are independent, so create them concurrently
+    nonprod_template, prod_template = await asyncio.gather(
+        _call(
+            semaphore, automation.create_org_level_pipeline_template,
+            template_name="NonProd Deployment Pipeline",
+            template_identifier="nonprod_deployment_pipeline",
+            template_yaml_path=os.path.join(templates_dir, 'pipeline-template-nonprod.yaml'),
+            replacements=template_replacements,
+            version_label=template_version
+        ),
+        _call(
+            semaphore, automation.create_org_level_pipeline_template,
+            template_name="Production Deployment Pipeline",
+            template_identifier="prod_deployment_pipeline",
+            template_yaml_path=os.path.join(templates_dir, 'pipeline-template-prod.yaml'),
+            replacements=template_replacements,
+            version_label=template_version
+        )
+    )
+    
+    templates = {
+        'nonprod': nonprod_template,
+        'prod': prod_template
+    }
+    
+    logger.info("\n✓ Org-level templates created successfully!")
+    logger.info("  - Template: nonprod_deployment_pipeline (org.%s)", org_id)
+    logger.info("  - Template: prod_deployment_pipeline (org.%s)", org_id)
+    return templates, template_version
+
+
+async def provision_project(automation: HarnessTemplateAutomation, semaphore: asyncio.Semaphore,
+                            project_config: Dict, template_version: str, templates: Optional[Dict]) -> None:
+    """Create one project and its two pipelines, then save its results file"""
+    project_name = project_config['repo_name']
+    project_id = project_name.translate(_PROJECT_ID_TABLE)
+    
+    results = {}
+    if templates is not None:
+        results['templates'] = templates
+    
+    # Step 2: Create project
+    logger.info("\n%s", _BANNER)
+    logger.info("STEP 2: Creating Project %s", project_name)
+    logger.info(_BANNER)
+    
+    project = await _call(
+        semaphore, automation.create_project,
+        project_name=project_name,
+        project_id=project_id,
+        description=project_config.get('description', '')
+    )
+    results['project'] = project
+    
+    # Step 3: Create pipelines from templates
+    logger.info("\n%s", _BANNER)
+    logger.info("STEP 3: Creating Pipelines from Templates for %s", project_name)
+    logger.info(_BANNER)
+    
+    logger.info("Using template version for pipelines: %s", template_version)
+    
+    nonprod_pipeline, prod_pipeline = await asyncio.gather(
+        _call(
+            semaphore, automation.create_pipeline_from_template,
+            project_id=project_id,
+            pipeline_name=f"{project_name} NonProd Pipeline",
+            pipeline_identifier=f"{project_id}_nonprod_pipeline",
+            template_ref="nonprod_deployment_pipeline",
+            template_version=template_version
+        ),
+        _call(
+            semaphore, automation.create_pipeline_from_template,
+            project_id=project_id,
+            pipeline_name=f"{project_name} Prod Pipeline",
+            pipeline_identifier=f"{project_id}_prod_pipeline",
+            template_ref="prod_deployment_pipeline",
+            template_version=template_version
+        )
+    )
+    
+    results['pipelines'] = {
+        'nonprod': nonprod_pipeline,
+        'prod': prod_pipeline
+    }
+    
+    # Success summary
+    logger.info("\n%s", _BANNER)
+    logger.info("✅ SUCCESS - Template-Based Setup Complete!")
+    logger.info(_BANNER)
+    logger.info("\nProject: %s", project_name)
+    logger.info("  ✓ Pipelines created from org-level templates")
+    logger.info("  ✓ NonProd Pipeline: %s_nonprod_pipeline", project_id)
+    logger.info("  ✓ Prod Pipeline: %s_prod_pipeline", project_id)
+    logger.info("\n📝 Both pipelines reference org-level templates")
+    logger.info("   - Update the template → all pipelines update!")
+    logger.info(_BANNER)
+    
+    # Save results
+    output_file = f"template_setup_results_{project_id}.json"
+    # One write of the encoded document; json.dump would issue a write per token
+    with open(output_file, 'w') as f:
+        f.write(json.dumps(results, indent=2))
+    
+    logger.info("\n✓ Results saved to: %s", output_file)
+
+
+async def run_setup(automation: HarnessTemplateAutomation, config: Dict, create_templates: bool) -> None:
+    """Create templates (optionally), then every configured project and its pipelines
+    
+    A config lists either one `project:` or several under `projects:`. Templates
+    are created once; the projects are then provisioned concurrently, sharing
+    one session and rate limit, and a failure in one doesn't stop the others.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    templates = None
+    template_version = "v1"  # Default version
+    
+    # Step 1: Create org-level templates (only if --create-templates flag)
+    if create_templates:
+        templates, template_version = await create_org_templates(automation, semaphore)
+    
+    projects = config.get('projects') or [config['project']]
+    outcomes = await asyncio.gather(
+        *(provision_project(automation, semaphore, project_config, template_version, templates)
+          for project_config in projects),
+        return_exceptions=True
+    )
+    failed = [f"{project_config['repo_name']} ({outcome})"
+              for project_config, outcome in zip(projects, outcomes) if isinstance(outcome, Exception)]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(projects)} projects failed: {', '.join(failed)}")
 
 
 def main():
     parser = argparse.ArgumentParser(description='Harness Automation with Templates')
-    parser.add_argument('--config-file', required=True, help='Path to config YAML file')
+    parser.add_argument('--config-file', required=True, help='Path to config YAML (or .json) file')
     parser.add_argument('--create-templates', action='store_true', 
                        help='Create org-level templates (do this once)')
     parser.add_argument('--dry-run', action='store_true', help='Dry run mode')
+    parser.add_argument('--quiet', action='store_true', help='Only log warnings and errors')
     
     args = parser.parse_args()
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
     
     # Load configuration
     config = load_config_from_file(args.config_file)
@@ -221,14 +511,14 @@ def main():
     account_id = config['harness']['account_id']
     api_key = config['harness']['api_key']
     org_id = config['harness']['org_id']
-    project_name = config['project']['repo_name']
-    project_id = project_name.lower().replace('-', '_')
+    projects = config.get('projects') or [config['project']]
     
     if args.dry_run:
         logger.info("DRY RUN MODE - No actual API calls will be made")
-        logger.info(f"Would create templates at org level: {org_id}")
-        logger.info(f"Would create project: {project_name}")
-        logger.info(f"Would create pipelines referencing templates")
+        logger.info("Would create templates at org level: %s", org_id)
+        for project_config in projects:
+            logger.info("Would create project: %s", project_config['repo_name'])
+        logger.info("Would create pipelines referencing templates")
         return
     
     automation = HarnessTemplateAutomation(
@@ -238,129 +528,12 @@ def main():
     )
     
     try:
-        results = {}
-        template_version = "v1"  # Default version
-        
-        # Step 1: Create org-level templates (only if --create-templates flag)
-        if args.create_templates:
-            logger.info("\n" + "=" * 80)
-            logger.info("STEP 1: Creating Org-Level Pipeline Templates")
-            logger.info("=" * 80)
-            
-            # Generic replacements for template (no project-specific values)
-            # Use <+input> for anything that varies by project
-            template_replacements = {
-                'PROJECT_NAME': '<+input>',
-                'PROJECT_IDENTIFIER': '<+input>',
-                'ORG_IDENTIFIER': org_id,
-                'CLUSTER_CONNECTOR_REF': '<+input>',
-                'DOCKER_CONNECTOR_REF': '<+input>',
-                'DOCKER_REGISTRY_CONNECTOR_REF': '<+input>',
-                'DOCKER_REGISTRY': 'docker.io',
-                'GIT_CONNECTOR_REF': '<+input>',
-                'REPO_NAME': '<+input>',
-                'SLACK_WEBHOOK_URL': '<+input>',
-                'PROJECT_IDENTIFIER_prod_approvers': '<+input>',
-                'PROJECT_IDENTIFIER_developers': '<+input>',
-                'PROJECT_IDENTIFIER_operators': '<+input>',
-                'PROJECT_NAME_service': '<+input>'
-            }
-            
-            import os
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            templates_dir = os.path.join(os.path.dirname(script_dir), 'templates')
-            
-            import time
-            template_version = f"v{int(time.time())}"  # Use timestamp for unique version
-            logger.info(f"Using version label: {template_version}")
-            
-            nonprod_template = automation.create_org_level_pipeline_template(
-                template_name="NonProd Deployment Pipeline",
-                template_identifier="nonprod_deployment_pipeline",
-                template_yaml_path=os.path.join(templates_dir, 'pipeline-template-nonprod.yaml'),
-                replacements=template_replacements,
-                version_label=template_version
-            )
-            
-            prod_template = automation.create_org_level_pipeline_template(
-                template_name="Production Deployment Pipeline",
-                template_identifier="prod_deployment_pipeline",
-                template_yaml_path=os.path.join(templates_dir, 'pipeline-template-prod.yaml'),
-                replacements=template_replacements,
-                version_label=template_version
-            )
-            
-            results['templates'] = {
-                'nonprod': nonprod_template,
-                'prod': prod_template
-            }
-            
-            logger.info("\n✓ Org-level templates created successfully!")
-            logger.info(f"  - Template: nonprod_deployment_pipeline (org.{org_id})")
-            logger.info(f"  - Template: prod_deployment_pipeline (org.{org_id})")
-        
-        # Step 2: Create project
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 2: Creating Project")
-        logger.info("=" * 80)
-        
-        project = automation.create_project(
-            project_name=project_name,
-            project_id=project_id,
-            description=config['project'].get('description', '')
-        )
-        results['project'] = project
-        
-        # Step 3: Create pipelines from templates
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 3: Creating Pipelines from Templates")
-        logger.info("=" * 80)
-        
-        logger.info(f"Using template version for pipelines: {template_version}")
-        
-        nonprod_pipeline = automation.create_pipeline_from_template(
-            project_id=project_id,
-            pipeline_name=f"{project_name} NonProd Pipeline",
-            pipeline_identifier=f"{project_id}_nonprod_pipeline",
-            template_ref="nonprod_deployment_pipeline",
-            template_version=template_version
-        )
-        
-        prod_pipeline = automation.create_pipeline_from_template(
-            project_id=project_id,
-            pipeline_name=f"{project_name} Prod Pipeline",
-            pipeline_identifier=f"{project_id}_prod_pipeline",
-            template_ref="prod_deployment_pipeline",
-            template_version=template_version
-        )
-        
-        results['pipelines'] = {
-            'nonprod': nonprod_pipeline,
-            'prod': prod_pipeline
-        }
-        
-        # Success summary
-        logger.info("\n" + "=" * 80)
-        logger.info("✅ SUCCESS - Template-Based Setup Complete!")
-        logger.info("=" * 80)
-        logger.info(f"\nProject: {project_name}")
-        logger.info(f"  ✓ Pipelines created from org-level templates")
-        logger.info(f"  ✓ NonProd Pipeline: {project_id}_nonprod_pipeline")
-        logger.info(f"  ✓ Prod Pipeline: {project_id}_prod_pipeline")
-        logger.info(f"\n📝 Both pipelines reference org-level templates")
-        logger.info(f"   - Update the template → all pipelines update!")
-        logger.info("=" * 80)
-        
-        # Save results
-        output_file = f"template_setup_results_{project_id}.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        logger.info(f"\n✓ Results saved to: {output_file}")
-        
+        asyncio.run(run_setup(automation, config, args.create_templates))
     except Exception as e:
-        logger.error(f"\n✗ Setup failed: {e}")
+        logger.error("\n✗ Setup failed: %s", e)
         sys.exit(1)
+    finally:
+        automation.close()
 
 
 if __name__ == "__main__":
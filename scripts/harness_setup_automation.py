@@ -4,23 +4,81 @@ Harness Automation Script
 Automates the creation of applications, pipelines, and RBAC setup in Harness
 """
 
+import atexit
 import os
+import queue
+import re
 import sys
 import json
 import yaml
 import argparse
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from typing import Dict, FrozenSet, List, Optional, Pattern
 import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-# Configure logging
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Configure logging. Records are queued and written by a background thread, so a slow
+# stderr (CI log collectors, ttys) doesn't stall the threads making API calls.
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes whatever is still queued
+# The queue side only merges the message args; the listener's handler adds the prefix
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 80
+_IDENT_TABLE = str.maketrans({"-": "_", " ": "_"})
+# Constant payload fragments, shared by every request (tuples, so they can't be mutated)
+_PROJECT_SCOPE_LEVELS = ("project",)
+# Per-request override of the session's JSON content type; x-api-key comes from the session
+_YAML_CONTENT_TYPE = {"Content-Type": "application/yaml"}
+
+# The substituted template is sent as-is, so these stand in for a full YAML parse
+_PIPELINE_ROOT = re.compile(r"^pipeline:[ \t]*$", re.M)
+_PIPELINE_NAME = re.compile(r"^[ \t]+name:[ \t]*(.+?)[ \t]*$", re.M)
+
+
+@lru_cache(maxsize=32)
+def _read_template(template_path: str, mtime: float) -> str:
+    """Read a pipeline template once; mtime is part of the key so edits are picked up"""
+    with open(template_path, 'rb') as f:
+        return f.read().decode()
+
+
+@lru_cache(maxsize=8)
+def _placeholder_pattern(placeholders: FrozenSet[str]) -> Pattern:
+    """Compile one alternation matching any placeholder
+    
+    Longer placeholders come first so one that extends another
+    (DOCKER_REGISTRY_CONNECTOR_REF vs DOCKER_REGISTRY) is never split.
+    """
+    if not placeholders:
+        return re.compile(r"(?!)")  # Matches nothing
+    return re.compile("|".join(re.escape(p) for p in sorted(placeholders, key=len, reverse=True)))
+
+
+@lru_cache(maxsize=1024)
+def _to_identifier(name: str) -> str:
+    """Turn a display name into a Harness identifier (lowercase, underscores)"""
+    return name.lower().translate(_IDENT_TABLE)
+
 
 class HarnessAutomation:
     """Main class for Harness automation operations"""
@@ -34,36 +92,68 @@ class HarnessAutomation:
             "Content-Type": "application/json",
             "x-api-key": api_key
         }
+        # Every endpoint is scoped to the same account and org
+        self._acct_org_qs = f"accountIdentifier={account_id}&orgIdentifier={org_id}"
+        
+        # Reuse one keep-alive connection to Harness instead of a new TLS handshake per call.
+        # Only idempotent methods are retried, so a create is never sent twice.
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False)
+        self.session = requests.Session()
+        # Set once here so individual requests don't each pass (and requests copy) the headers
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry))
+        # Sibling resources (both environments, both pipelines, ...) are created concurrently
+        self.executor = ThreadPoolExecutor(max_workers=8)
+    
+    def close(self) -> None:
+        """Release pooled connections and worker threads"""
+        self.executor.shutdown(wait=True)
+        self.session.close()
+    
+    def __enter__(self) -> "HarnessAutomation":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
         
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
         """Make HTTP request to Harness API"""
         url = f"{self.base_url}{endpoint}"
         
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        # Compact encoding; the session already sends Content-Type: application/json
+        body = None if data is None else json.dumps(data, separators=(',', ':'), allow_nan=False).encode('utf-8')
+        
         try:
-            if method == "GET":
-                response = requests.get(url, headers=self.headers)
-            elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
-            elif method == "PUT":
-                response = requests.put(url, headers=self.headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
+            response = self.session.request(method, url, data=body)
             response.raise_for_status()
-            return response.json()
+            return self._decode(response)
         except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
+            logger.error("API request failed: %s", e)
             if hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise
     
+    @staticmethod
+    def _decode(response: requests.Response) -> Dict:
+        """Decode a Harness response body
+        
+        Parses the raw bytes directly (json detects UTF-8 itself), skipping the
+        charset detection and str decode that Response.json() goes through.
+        Empty bodies decode to {}.
+        """
+        if not response.content:
+            return {}
+        return json.loads(response.content)
+    
     def create_project(self, project_name: str, project_identifier: str, description: str = "") -> Dict:
         """Create a new Harness project"""
-        logger.info(f"Creating project: {project_name}")
+        logger.info("Creating project: %s", project_name)
         
-        endpoint = f"/ng/api/projects?accountIdentifier={self.account_id}&orgIdentifier={self.org_id}"
+        endpoint = f"/ng/api/projects?{self._acct_org_qs}"
         
         payload = {
             "project": {
@@ -81,22 +171,19 @@ class HarnessAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Project created successfully: {project_name}")
+            logger.info("✓ Project created successfully: %s", project_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create project: {e}")
+            logger.error("✗ Failed to create project: %s", e)
             raise
     
     def create_service(self, project_id: str, service_name: str, service_type: str = "Kubernetes") -> Dict:
         """Create a Harness service"""
-        logger.info(f"Creating service: {service_name}")
+        logger.info("Creating service: %s", service_name)
         
-        endpoint = (f"/ng/api/servicesV2?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/servicesV2?{self._acct_org_qs}&projectIdentifier={project_id}"
         
-        service_identifier = service_name.lower().replace("-", "_").replace(" ", "_")
+        service_identifier = _to_identifier(service_name)
         
         payload = {
             "identifier": service_identifier,
@@ -144,22 +231,19 @@ class HarnessAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Service created successfully: {service_name}")
+            logger.info("✓ Service created successfully: %s", service_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create service: {e}")
+            logger.error("✗ Failed to create service: %s", e)
             raise
     
     def create_environment(self, project_id: str, env_name: str, env_type: str = "PreProduction") -> Dict:
         """Create a Harness environment"""
-        logger.info(f"Creating environment: {env_name}")
+        logger.info("Creating environment: %s", env_name)
         
-        endpoint = (f"/ng/api/environmentsV2?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/environmentsV2?{self._acct_org_qs}&projectIdentifier={project_id}"
         
-        env_identifier = env_name.lower().replace("-", "_")
+        env_identifier = _to_identifier(env_name)
         
         payload = {
             "identifier": env_identifier,
@@ -186,23 +270,20 @@ class HarnessAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Environment created successfully: {env_name}")
+            logger.info("✓ Environment created successfully: %s", env_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create environment: {e}")
+            logger.error("✗ Failed to create environment: %s", e)
             raise
     
     def create_infrastructure(self, project_id: str, env_id: str, infra_name: str, 
                             connector_ref: str, namespace: str) -> Dict:
         """Create infrastructure definition"""
-        logger.info(f"Creating infrastructure: {infra_name}")
+        logger.info("Creating infrastructure: %s", infra_name)
         
-        endpoint = (f"/ng/api/infrastructures?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/infrastructures?{self._acct_org_qs}&projectIdentifier={project_id}"
         
-        infra_identifier = infra_name.lower().replace("-", "_")
+        infra_identifier = _to_identifier(infra_name)
         
         payload = {
             "identifier": infra_identifier,
@@ -233,69 +314,55 @@ class HarnessAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Infrastructure created successfully: {infra_name}")
+            logger.info("✓ Infrastructure created successfully: %s", infra_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create infrastructure: {e}")
+            logger.error("✗ Failed to create infrastructure: %s", e)
             raise
     
     def create_pipeline_from_template(self, project_id: str, template_path: str, 
                                      replacements: Dict[str, str]) -> Dict:
         """Create pipeline from template file"""
-        logger.info(f"Creating pipeline from template: {template_path}")
-        
-        # Read template
-        with open(template_path, 'r') as f:
-            template_content = f.read()
+        logger.info("Creating pipeline from template: %s", template_path)
         
-        # Replace placeholders (without angle brackets)
-        for key, value in replacements.items():
-            template_content = template_content.replace(key, str(value))
+        template_content = _read_template(template_path, os.path.getmtime(template_path))
         
-        # Parse YAML
-        pipeline_yaml = yaml.safe_load(template_content)
+        # Replace placeholders (without angle brackets) in a single pass over the template
+        values = {key: str(value) for key, value in replacements.items()}
+        pattern = _placeholder_pattern(frozenset(values))
+        template_content = pattern.sub(lambda m: values[m.group(0)], template_content)
         
         # Validate pipeline structure
-        if 'pipeline' not in pipeline_yaml:
+        root = _PIPELINE_ROOT.search(template_content)
+        if not root:
             raise ValueError("Invalid pipeline template: missing 'pipeline' key")
+        name_match = _PIPELINE_NAME.search(template_content, root.end())
+        pipeline_name = name_match.group(1).strip('\'"') if name_match else template_path
         
         # Use correct pipeline API endpoint (not /ng/api)
-        endpoint = (f"/pipeline/api/pipelines/v2?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
-        
-        # Convert YAML to string for API (Harness expects direct YAML)
-        pipeline_yaml_str = yaml.dump(pipeline_yaml, default_flow_style=False, sort_keys=False)
+        endpoint = f"/pipeline/api/pipelines/v2?{self._acct_org_qs}&projectIdentifier={project_id}"
         
         try:
             url = f"{self.base_url}{endpoint}"
-            headers = {
-                "Content-Type": "application/yaml",
-                "x-api-key": self.api_key
-            }
-            
-            # Send YAML directly in body
-            response = requests.post(url, headers=headers, data=pipeline_yaml_str)
+            # Send the substituted template directly in body (Harness expects YAML).
+            # Encoded up front: a str body would be sent as latin-1 by http.client.
+            response = self.session.post(url, headers=_YAML_CONTENT_TYPE, data=template_content.encode('utf-8'))
             response.raise_for_status()
             
-            logger.info(f"✓ Pipeline created successfully: {pipeline_yaml['pipeline']['name']}")
-            return response.json()
+            logger.info("✓ Pipeline created successfully: %s", pipeline_name)
+            return self._decode(response)
         except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Failed to create pipeline: {e}")
+            logger.error("✗ Failed to create pipeline: %s", e)
             if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise
     
     def create_user_group(self, project_id: str, group_name: str, group_id: str, 
                          description: str, users: List[str] = None) -> Dict:
         """Create a user group"""
-        logger.info(f"Creating user group: {group_name}")
+        logger.info("Creating user group: %s", group_name)
         
-        endpoint = (f"/ng/api/user-groups?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/user-groups?{self._acct_org_qs}&projectIdentifier={project_id}"
         
         payload = {
             "identifier": group_id,
@@ -310,21 +377,18 @@ class HarnessAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ User group created successfully: {group_name}")
+            logger.info("✓ User group created successfully: %s", group_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create user group: {e}")
+            logger.error("✗ Failed to create user group: %s", e)
             raise
     
     def create_resource_group(self, project_id: str, rg_name: str, rg_id: str,
                              resources: List[Dict]) -> Dict:
         """Create a resource group"""
-        logger.info(f"Creating resource group: {rg_name}")
+        logger.info("Creating resource group: %s", rg_name)
         
-        endpoint = (f"/ng/api/resourcegroup?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/resourcegroup?{self._acct_org_qs}&projectIdentifier={project_id}"
         
         payload = {
             "resourceGroup": {
@@ -334,7 +398,7 @@ class HarnessAutomation:
                 "tags": {
                     "automation": "true"
                 },
-                "allowedScopeLevels": ["project"],
+                "allowedScopeLevels": _PROJECT_SCOPE_LEVELS,
                 "includedScopes": [
                     {
                         "filter": "INCLUDING_CHILD_SCOPES",
@@ -352,21 +416,18 @@ class HarnessAutomation:
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Resource group created successfully: {rg_name}")
+            logger.info("✓ Resource group created successfully: %s", rg_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create resource group: {e}")
+            logger.error("✗ Failed to create resource group: %s", e)
             raise
     
     def create_role(self, project_id: str, role_name: str, role_id: str,
                    permissions: List[str]) -> Dict:
         """Create a custom role"""
-        logger.info(f"Creating role: {role_name}")
+        logger.info("Creating role: %s", role_name)
         
-        endpoint = (f"/ng/api/roles?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/roles?{self._acct_org_qs}&projectIdentifier={project_id}"
         
         payload = {
             "role": {
@@ -377,57 +438,87 @@ class HarnessAutomation:
                     "automation": "true"
                 },
                 "permissions": permissions,
-                "allowedScopeLevels": ["project"]
+                "allowedScopeLevels": _PROJECT_SCOPE_LEVELS
             }
         }
         
         try:
             result = self._make_request("POST", endpoint, payload)
-            logger.info(f"✓ Role created successfully: {role_name}")
+            logger.info("✓ Role created successfully: %s", role_name)
             return result
         except Exception as e:
-            logger.error(f"✗ Failed to create role: {e}")
+            logger.error("✗ Failed to create role: %s", e)
             raise
     
     def create_role_assignment(self, project_id: str, resource_group_id: str,
                               role_id: str, user_group_ids: List[str]) -> Dict:
         """Create role assignment (bind role to user groups for resource group)"""
-        logger.info(f"Creating role assignment for resource group: {resource_group_id}")
+        logger.info("Creating role assignment for resource group: %s", resource_group_id)
         
-        endpoint = (f"/ng/api/roleassignments?"
-                   f"accountIdentifier={self.account_id}&"
-                   f"orgIdentifier={self.org_id}&"
-                   f"projectIdentifier={project_id}")
+        endpoint = f"/ng/api/roleassignments?{self._acct_org_qs}&projectIdentifier={project_id}"
+        
+        # Everything but the principal is the same for each group. Each payload still
+        # gets its own dicts: they're encoded on worker threads, so sharing would race.
+        assignment = {
+            "resourceGroupIdentifier": resource_group_id,
+            "roleIdentifier": role_id,
+            "disabled": False,
+            "managed": False
+        }
         
+        # The assignments are independent, so they are posted concurrently over the pooled session
+        futures = {}
         for user_group_id in user_group_ids:
-            payload = {
-                "roleAssignment": {
-                    "resourceGroupIdentifier": resource_group_id,
-                    "roleIdentifier": role_id,
-                    "principal": {
-                        "type": "USER_GROUP",
-                        "identifier": user_group_id,
-                        "scopeLevel": "project"
-                    },
-                    "disabled": False,
-                    "managed": False
-                }
-            }
-            
+            principal = {"type": "USER_GROUP", "identifier": user_group_id, "scopeLevel": "project"}
+            payload = {"roleAssignment": {**assignment, "principal": principal}}
+            futures[user_group_id] = self.executor.submit(self._make_request, "POST", endpoint, payload)
+        
+        for user_group_id, future in futures.items():
             try:
-                result = self._make_request("POST", endpoint, payload)
-                logger.info(f"✓ Role assignment created for user group: {user_group_id}")
+                future.result()
+                logger.info("✓ Role assignment created for user group: %s", user_group_id)
             except Exception as e:
-                logger.error(f"✗ Failed to create role assignment: {e}")
+                logger.error("✗ Failed to create role assignment: %s", e)
                 raise
         
         return {"status": "success"}
     
+    def _preflight(self, config: Dict) -> None:
+        """Check config and templates locally before any API call
+        
+        A problem found halfway through setup leaves a partially created project,
+        so everything checkable offline is checked up front and reported together.
+        """
+        problems = []
+        
+        required = ['project_name', 'project_identifier', 'nonprod_template_path', 'prod_template_path']
+        problems.extend(f"missing config key: {key}" for key in required if not config.get(key))
+        
+        for key in ('nonprod_template_path', 'prod_template_path'):
+            template_path = config.get(key)
+            if not template_path:
+                continue
+            if not os.path.isfile(template_path):
+                problems.append(f"{key}: template not found: {template_path}")
+                continue
+            try:
+                template_content = _read_template(template_path, os.path.getmtime(template_path))
+            except (OSError, UnicodeDecodeError) as e:
+                problems.append(f"{key}: cannot read {template_path}: {e}")
+                continue
+            if not _PIPELINE_ROOT.search(template_content):
+                problems.append(f"{key}: missing 'pipeline' key in {template_path}")
+        
+        if problems:
+            raise ValueError("Invalid project setup configuration:\n  - " + "\n  - ".join(problems))
+    
     def setup_full_project(self, config: Dict) -> Dict:
         """Complete project setup with all resources"""
-        logger.info("=" * 80)
+        self._preflight(config)
+        
+        logger.info(_BANNER)
         logger.info("Starting Full Project Setup")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         
         results = {}
         
@@ -451,35 +542,39 @@ class HarnessAutomation:
             
             # 3. Create Environments
             logger.info("\n3. Creating Environments...")
-            staging_env = self.create_environment(
+            staging_env = self.executor.submit(
+                self.create_environment,
                 project_id=config['project_identifier'],
                 env_name="staging",
                 env_type="PreProduction"
             )
-            prod_env = self.create_environment(
+            prod_env = self.executor.submit(
+                self.create_environment,
                 project_id=config['project_identifier'],
                 env_name="production",
                 env_type="Production"
             )
-            results['environments'] = {'staging': staging_env, 'production': prod_env}
+            results['environments'] = {'staging': staging_env.result(), 'production': prod_env.result()}
             
             # 4. Create Infrastructures
             logger.info("\n4. Creating Infrastructures...")
-            staging_infra = self.create_infrastructure(
+            staging_infra = self.executor.submit(
+                self.create_infrastructure,
                 project_id=config['project_identifier'],
                 env_id="staging",
                 infra_name="staging_infra",
                 connector_ref=config.get('cluster_connector', '<+input>'),
                 namespace=f"{config['project_name']}-staging"
             )
-            prod_infra = self.create_infrastructure(
+            prod_infra = self.executor.submit(
+                self.create_infrastructure,
                 project_id=config['project_identifier'],
                 env_id="production",
                 infra_name="prod_infra_primary",
                 connector_ref=config.get('cluster_connector', '<+input>'),
                 namespace=f"{config['project_name']}-prod"
             )
-            results['infrastructures'] = {'staging': staging_infra, 'production': prod_infra}
+            results['infrastructures'] = {'staging': staging_infra.result(), 'production': prod_infra.result()}
             
             # 5. Create Pipelines
             logger.info("\n5. Creating Pipelines...")
@@ -496,31 +591,33 @@ class HarnessAutomation:
                 'SLACK_WEBHOOK_URL': config.get('slack_webhook', '<+input>')
             }
             
-            nonprod_pipeline = self.create_pipeline_from_template(
+            nonprod_pipeline = self.executor.submit(
+                self.create_pipeline_from_template,
                 project_id=config['project_identifier'],
                 template_path=config['nonprod_template_path'],
                 replacements=replacements
             )
-            prod_pipeline = self.create_pipeline_from_template(
+            prod_pipeline = self.executor.submit(
+                self.create_pipeline_from_template,
                 project_id=config['project_identifier'],
                 template_path=config['prod_template_path'],
                 replacements=replacements
             )
-            results['pipelines'] = {'nonprod': nonprod_pipeline, 'prod': prod_pipeline}
+            results['pipelines'] = {'nonprod': nonprod_pipeline.result(), 'prod': prod_pipeline.result()}
             
             # 6. Setup RBAC
             logger.info("\n6. Setting up RBAC...")
             rbac_results = self.setup_rbac(config)
             results['rbac'] = rbac_results
             
-            logger.info("\n" + "=" * 80)
+            logger.info("\n%s", _BANNER)
             logger.info("✓ Full Project Setup Completed Successfully!")
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             
             return results
             
         except Exception as e:
-            logger.error(f"\n✗ Project setup failed: {e}")
+            logger.error("\n✗ Project setup failed: %s", e)
             raise
     
     def setup_rbac(self, config: Dict) -> Dict:
@@ -533,7 +630,8 @@ class HarnessAutomation:
         try:
             # Create User Groups
             logger.info("Creating user groups...")
-            developers_group = self.create_user_group(
+            developers_group = self.executor.submit(
+                self.create_user_group,
                 project_id=project_id,
                 group_name=f"{project_name} Developers",
                 group_id=f"{project_id}_developers",
@@ -541,7 +639,8 @@ class HarnessAutomation:
                 users=config.get('developer_users', [])
             )
             
-            approvers_group = self.create_user_group(
+            approvers_group = self.executor.submit(
+                self.create_user_group,
                 project_id=project_id,
                 group_name=f"{project_name} Production Approvers",
                 group_id=f"{project_id}_prod_approvers",
@@ -549,7 +648,8 @@ class HarnessAutomation:
                 users=config.get('approver_users', [])
             )
             
-            operators_group = self.create_user_group(
+            operators_group = self.executor.submit(
+                self.create_user_group,
                 project_id=project_id,
                 group_name=f"{project_name} Operators",
                 group_id=f"{project_id}_operators",
@@ -558,9 +658,9 @@ class HarnessAutomation:
             )
             
             rbac_results['user_groups'] = {
-                'developers': developers_group,
-                'approvers': approvers_group,
-                'operators': operators_group
+                'developers': developers_group.result(),
+                'approvers': approvers_group.result(),
+                'operators': operators_group.result()
             }
             
             # Create Resource Groups
@@ -575,14 +675,16 @@ class HarnessAutomation:
                 {"resourceType": "PIPELINE", "identifiers": [f"{project_id}_prod_pipeline"]}
             ]
             
-            staging_rg = self.create_resource_group(
+            staging_rg = self.executor.submit(
+                self.create_resource_group,
                 project_id=project_id,
                 rg_name=f"{project_name} Staging Resources",
                 rg_id=f"{project_id}_staging_resources",
                 resources=staging_resources
             )
             
-            prod_rg = self.create_resource_group(
+            prod_rg = self.executor.submit(
+                self.create_resource_group,
                 project_id=project_id,
                 rg_name=f"{project_name} Production Resources",
                 rg_id=f"{project_id}_prod_resources",
@@ -590,8 +692,8 @@ class HarnessAutomation:
             )
             
             rbac_results['resource_groups'] = {
-                'staging': staging_rg,
-                'production': prod_rg
+                'staging': staging_rg.result(),
+                'production': prod_rg.result()
             }
             
             logger.info("✓ RBAC setup completed successfully")
@@ -599,15 +701,17 @@ class HarnessAutomation:
             return rbac_results
             
         except Exception as e:
-            logger.error(f"✗ RBAC setup failed: {e}")
+            logger.error("✗ RBAC setup failed: %s", e)
             raise
 
 
+@lru_cache(maxsize=256)
 def parse_repository_name(repo_name: str) -> Dict[str, str]:
     """
     Parse repository name to extract project information
     Expected format: <org>-<project>-<service>
     Example: sfdc-customer-portal-backend
+    The result is cached and shared between callers, so don't mutate it.
     """
     parts = repo_name.split('-')
     
@@ -615,7 +719,7 @@ def parse_repository_name(repo_name: str) -> Dict[str, str]:
         raise ValueError(f"Invalid repository name format: {repo_name}")
     
     # Create project identifier (lowercase, underscores)
-    project_identifier = repo_name.lower().replace('-', '_')
+    project_identifier = _to_identifier(repo_name)
     
     return {
         'project_name': repo_name,
@@ -628,10 +732,10 @@ def load_config_from_file(config_path: str) -> Dict:
     """Load configuration from YAML file"""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
         return config
     except Exception as e:
-        logger.error(f"Failed to load configuration file: {e}")
+        logger.error("Failed to load configuration file: %s", e)
         raise
 
 
@@ -703,7 +807,7 @@ def main():
     required = ['account_id', 'api_key', 'org_id', 'repo_name']
     missing = [arg for arg in required if not getattr(args, arg, None)]
     if missing:
-        logger.error(f"Missing required arguments: {', '.join(missing)}")
+        logger.error("Missing required arguments: %s", ', '.join(missing))
         parser.print_help()
         sys.exit(1)
     
@@ -711,20 +815,13 @@ def main():
         # Parse repository name
         project_info = parse_repository_name(args.repo_name)
         
-        logger.info(f"Project Name: {project_info['project_name']}")
-        logger.info(f"Project Identifier: {project_info['project_identifier']}")
+        logger.info("Project Name: %s", project_info['project_name'])
+        logger.info("Project Identifier: %s", project_info['project_identifier'])
         
         if args.dry_run:
             logger.info("DRY RUN MODE - No actual API calls will be made")
             return
         
-        # Initialize automation
-        automation = HarnessAutomation(
-            account_id=args.account_id,
-            api_key=args.api_key,
-            org_id=args.org_id
-        )
-        
         # Prepare configuration
         config = {
             'project_name': project_info['project_name'],
@@ -745,17 +842,23 @@ def main():
         }
         
         # Run full project setup
-        results = automation.setup_full_project(config)
+        with HarnessAutomation(
+            account_id=args.account_id,
+            api_key=args.api_key,
+            org_id=args.org_id
+        ) as automation:
+            results = automation.setup_full_project(config)
         
         # Save results to file
         output_file = f"harness_setup_results_{project_info['project_identifier']}.json"
+        # One write of the encoded document; json.dump would issue a write per token
         with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+            f.write(json.dumps(results, indent=2))
         
-        logger.info(f"\n✓ Setup results saved to: {output_file}")
+        logger.info("\n✓ Setup results saved to: %s", output_file)
         
     except Exception as e:
-        logger.error(f"\n✗ Automation failed: {e}")
+        logger.error("\n✗ Automation failed: %s", e)
         sys.exit(1)
 
 
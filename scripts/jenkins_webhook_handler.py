@@ -8,14 +8,34 @@ to create Harness projects automatically.
 
 from flask import Flask, request, jsonify
 import requests
-import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import logging
+import logging.handlers
+import atexit
+import queue
 import hmac
+import json
 import hashlib
 import os
-from typing import Dict, Optional
+import string
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Request threads only enqueue log records; a background listener formats and writes them,
+# so a slow stderr never holds up a webhook reply
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes whatever is still queued
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(message)s',
+                    handlers=[logging.handlers.QueueHandler(_log_queue)])
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -28,39 +48,124 @@ JENKINS_JOB_NAME = os.getenv('JENKINS_JOB_NAME', 'harness-automation')
 GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET', '')
 GITLAB_WEBHOOK_TOKEN = os.getenv('GITLAB_WEBHOOK_TOKEN', '')
 
+# Resolved once from the configuration above
+_JENKINS_BUILD_URL = f"{JENKINS_URL}/job/{JENKINS_JOB_NAME}/buildWithParameters"
+_JENKINS_AUTH = (JENKINS_USER, JENKINS_TOKEN)
+# (connect, read) seconds per attempt, so a hung Jenkins can't hold a trigger-pool thread or
+# a synchronous /webhook/manual caller indefinitely. GitHub/GitLab deliveries are already
+# acknowledged before Jenkins is called. With the single connect retry on JENKINS_SESSION, a
+# trigger gives up after at most two 3s connects plus one 8s read (about 14s).
+JENKINS_TIMEOUT = (3, 8)
+
+# Build parameters that are the same for every project (read-only; copied per trigger)
+_JENKINS_PARAMS_BASE = MappingProxyType({
+    'ACTION': 'create-project',
+    'NONPROD_TEMPLATE_REF': 'nonprod_deployment_pipeline',
+    'NONPROD_TEMPLATE_VERSION': 'v1760729233',
+    'PROD_TEMPLATE_REF': 'prod_deployment_pipeline',
+    'PROD_TEMPLATE_VERSION': 'v1760729233',
+    'CREATE_RBAC': 'true'
+})
+
+# Lowercases and maps ' ' -> '-' in one pass; Harness only accepts ASCII project names anyway
+_SLUG_TABLE = str.maketrans({' ': '-', **{c: c.lower() for c in string.ascii_uppercase}})
+
+# Liveness probes hit /health every few seconds; its body never changes
+_HEALTH_BODY = json.dumps({'status': 'healthy', 'service': 'harness-webhook-handler'}).encode()
+
+# Read-only stand-in for missing or null objects in webhook payloads
+_EMPTY = MappingProxyType({})
+
+# HMAC key and shared token, encoded once rather than on every delivery
+_GITHUB_SECRET_BYTES = GITHUB_WEBHOOK_SECRET.encode()
+_GITLAB_TOKEN_BYTES = GITLAB_WEBHOOK_TOKEN.encode()
+
+# One pooled session for all Jenkins calls, so webhooks reuse a keep-alive connection.
+# Only connection failures and idempotent methods are retried; a build trigger is never replayed.
+# A failed connect is retried once, which keeps a trigger within the JENKINS_TIMEOUT budget.
+JENKINS_SESSION = requests.Session()
+JENKINS_SESSION.auth = _JENKINS_AUTH
+_jenkins_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                               max_retries=Retry(total=3, connect=1, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                                                 raise_on_status=False))
+JENKINS_SESSION.mount('http://', _jenkins_adapter)
+JENKINS_SESSION.mount('https://', _jenkins_adapter)
+
+# GitHub/GitLab webhooks are acknowledged once verified; the Jenkins trigger runs here.
+# GitHub gives up on a delivery after 10s, so the reply must not wait on Jenkins.
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='jenkins-trigger')
+
+# Recently seen delivery IDs, oldest first. GitHub/GitLab redeliver with the same ID,
+# which would otherwise trigger a second Jenkins build for the same repository.
+# This is per process, so the handler must run as a single (threaded) worker.
+DELIVERY_TTL_SECONDS = 600
+MAX_TRACKED_DELIVERIES = 4096
+_seen_deliveries: 'OrderedDict[Tuple[str, str], float]' = OrderedDict()
+_seen_deliveries_lock = threading.Lock()
+
 
 def verify_github_signature(payload: bytes, signature: str) -> bool:
     """Verify GitHub webhook signature"""
-    if not GITHUB_WEBHOOK_SECRET:
+    if not _GITHUB_SECRET_BYTES:
         logger.warning("No GitHub webhook secret configured, skipping verification")
         return True
     
-    expected_signature = 'sha256=' + hmac.new(
-        GITHUB_WEBHOOK_SECRET.encode(),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
+    if not signature.startswith('sha256='):
+        return False
+    
+    expected_digest = hmac.new(_GITHUB_SECRET_BYTES, payload, hashlib.sha256).hexdigest()
     
-    return hmac.compare_digest(signature, expected_signature)
+    # Compare as bytes: compare_digest rejects non-ASCII str, which a forged header could contain
+    return hmac.compare_digest(signature[7:].encode(), expected_digest.encode())
 
 
 def verify_gitlab_token(token: str) -> bool:
     """Verify GitLab webhook token"""
-    if not GITLAB_WEBHOOK_TOKEN:
+    if not _GITLAB_TOKEN_BYTES:
         logger.warning("No GitLab webhook token configured, skipping verification")
         return True
     
-    return hmac.compare_digest(token, GITLAB_WEBHOOK_TOKEN)
+    return hmac.compare_digest(token.encode('utf-8', 'replace'), _GITLAB_TOKEN_BYTES)
+
+
+def is_duplicate_delivery(provider: str, delivery_id: str) -> bool:
+    """Record a webhook delivery and report whether it was already seen recently"""
+    if not delivery_id:
+        return False
+    
+    key = (provider, delivery_id)
+    now = time.monotonic()
+    
+    with _seen_deliveries_lock:
+        # Entries are in arrival order, so expired ones are all at the front
+        while _seen_deliveries and next(iter(_seen_deliveries.values())) <= now - DELIVERY_TTL_SECONDS:
+            _seen_deliveries.popitem(last=False)
+        
+        if key in _seen_deliveries:
+            return True
+        
+        _seen_deliveries[key] = now
+        if len(_seen_deliveries) > MAX_TRACKED_DELIVERIES:
+            _seen_deliveries.popitem(last=False)
+    
+    return False
+
+
+def forget_delivery(provider: str, delivery_id: str):
+    """Drop a recorded delivery so a redelivery of it is processed again"""
+    with _seen_deliveries_lock:
+        _seen_deliveries.pop((provider, delivery_id), None)
 
 
 def extract_repo_info_github(payload: Dict) -> Optional[Dict]:
     """Extract repository information from GitHub webhook"""
     try:
-        repo = payload.get('repository', {})
+        repo = payload.get('repository') or _EMPTY
+        owner = repo.get('owner') or _EMPTY
         return {
             'name': repo.get('name', ''),
             'full_name': repo.get('full_name', ''),
-            'owner': repo.get('owner', {}).get('login', ''),
+            'owner': owner.get('login', ''),
             'description': repo.get('description', ''),
             'default_branch': repo.get('default_branch', 'main'),
             'url': repo.get('html_url', '')
@@ -73,7 +178,7 @@ def extract_repo_info_github(payload: Dict) -> Optional[Dict]:
 def extract_repo_info_gitlab(payload: Dict) -> Optional[Dict]:
     """Extract repository information from GitLab webhook"""
     try:
-        project = payload.get('project', {})
+        project = payload.get('project') or _EMPTY
         return {
             'name': project.get('name', ''),
             'full_name': project.get('path_with_namespace', ''),
@@ -87,84 +192,101 @@ def extract_repo_info_gitlab(payload: Dict) -> Optional[Dict]:
         return None
 
 
-def trigger_jenkins_job(project_name: str, repo_info: Dict) -> bool:
-    """Trigger Jenkins job with parameters"""
+def trigger_jenkins_job(project_name: str, repo_info: Dict,
+                        delivery: Optional[Tuple[str, str]] = None) -> bool:
+    """Trigger Jenkins job with parameters
+    
+    delivery is the (provider, delivery ID) that caused the trigger. If the trigger
+    fails, that ID is released so the provider's redelivery is not answered as a
+    duplicate. A timed-out trigger keeps it reserved, because Jenkins may have
+    queued the build.
+    """
     try:
-        jenkins_build_url = f"{JENKINS_URL}/job/{JENKINS_JOB_NAME}/buildWithParameters"
-        
         params = {
-            'ACTION': 'create-project',
-            'PROJECT_NAME': project_name.lower().replace(' ', '-'),
-            'PROJECT_DESCRIPTION': repo_info.get('description', f"Auto-created from {repo_info.get('full_name')}"),
-            'NONPROD_TEMPLATE_REF': 'nonprod_deployment_pipeline',
-            'NONPROD_TEMPLATE_VERSION': 'v1760729233',
-            'PROD_TEMPLATE_REF': 'prod_deployment_pipeline',
-            'PROD_TEMPLATE_VERSION': 'v1760729233',
-            'CREATE_RBAC': 'true'
+            **_JENKINS_PARAMS_BASE,
+            'PROJECT_NAME': project_name.translate(_SLUG_TABLE),
+            'PROJECT_DESCRIPTION': repo_info.get('description', f"Auto-created from {repo_info.get('full_name')}")
         }
         
         logger.info(f"Triggering Jenkins job: {JENKINS_JOB_NAME}")
-        logger.info(f"Parameters: {params}")
+        logger.debug("Parameters: %s", params)
         
-        response = requests.post(
-            jenkins_build_url,
-            params=params,
-            auth=(JENKINS_USER, JENKINS_TOKEN)
+        # Parameters go in a form-encoded body: repository descriptions can be long enough
+        # to push a query string past Jenkins or proxy URL limits
+        response = JENKINS_SESSION.post(
+            _JENKINS_BUILD_URL,
+            data=params,
+            timeout=JENKINS_TIMEOUT
         )
         
         response.raise_for_status()
         logger.info(f"✅ Jenkins job triggered successfully")
         return True
         
+    except requests.Timeout as e:
+        # On a read timeout Jenkins may still have queued the build; check before re-triggering
+        logger.error(f"❌ Timed out triggering Jenkins job for {project_name}: {e}")
+        return False
     except Exception as e:
         logger.error(f"❌ Failed to trigger Jenkins job: {e}")
+        if delivery is not None:
+            forget_delivery(*delivery)
         return False
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'harness-webhook-handler'}), 200
+    return app.response_class(_HEALTH_BODY, status=200, mimetype='application/json')
 
 
 @app.route('/webhook/github', methods=['POST'])
 def github_webhook():
     """Handle GitHub webhook events"""
-    # Verify signature
+    event_type = request.headers.get('X-GitHub-Event', '')
+    
+    logger.info(f"Received GitHub webhook: {event_type}")
+    
+    # Only repository events can be processed; skip reading the body for anything else
+    if event_type != 'repository':
+        return jsonify({'status': 'ignored', 'message': f'Event {event_type} not processed'}), 200
+    
+    # Verify signature. The body is only needed here and for the one parse below,
+    # so Flask isn't asked to keep its own cached copy of it.
+    raw_payload = request.get_data(cache=False)
     signature = request.headers.get('X-Hub-Signature-256', '')
-    if not verify_github_signature(request.data, signature):
+    if not verify_github_signature(raw_payload, signature):
         logger.warning("Invalid GitHub webhook signature")
         return jsonify({'error': 'Invalid signature'}), 401
     
-    event_type = request.headers.get('X-GitHub-Event', '')
-    payload = request.json
-    
-    logger.info(f"Received GitHub webhook: {event_type}")
+    try:
+        payload = json.loads(raw_payload)
+    except ValueError:
+        return jsonify({'error': 'Invalid JSON payload'}), 400
     
     # Only process repository creation events
-    if event_type == 'repository':
-        action = payload.get('action', '')
+    action = payload.get('action', '')
+    
+    if action == 'created':
+        repo_info = extract_repo_info_github(payload)
         
-        if action == 'created':
-            repo_info = extract_repo_info_github(payload)
+        # A payload without a repository name has nothing to create a project for
+        if repo_info and repo_info['name']:
+            logger.info(f"New repository created: {repo_info['full_name']}")
+            
+            delivery_id = request.headers.get('X-GitHub-Delivery', '')
+            if is_duplicate_delivery('github', delivery_id):
+                logger.info(f"Duplicate GitHub delivery for {repo_info['full_name']}, skipping")
+                return jsonify({'status': 'duplicate', 'message': 'Delivery already processed'}), 200
             
-            if repo_info:
-                logger.info(f"New repository created: {repo_info['full_name']}")
-                
-                # Trigger Jenkins job
-                success = trigger_jenkins_job(repo_info['name'], repo_info)
-                
-                if success:
-                    return jsonify({
-                        'status': 'success',
-                        'message': f"Harness project creation triggered for {repo_info['name']}",
-                        'project_name': repo_info['name']
-                    }), 200
-                else:
-                    return jsonify({
-                        'status': 'error',
-                        'message': 'Failed to trigger Jenkins job'
-                    }), 500
+            # Trigger Jenkins job in the background
+            EXECUTOR.submit(trigger_jenkins_job, repo_info['name'], repo_info, ('github', delivery_id))
+            
+            return jsonify({
+                'status': 'queued',
+                'message': f"Harness project creation queued for {repo_info['name']}",
+                'project_name': repo_info['name']
+            }), 202
     
     return jsonify({'status': 'ignored', 'message': f'Event {event_type} not processed'}), 200
 
@@ -172,45 +294,49 @@ def github_webhook():
 @app.route('/webhook/gitlab', methods=['POST'])
 def gitlab_webhook():
     """Handle GitLab webhook events"""
+    event_type = request.headers.get('X-Gitlab-Event', '')
+    
+    logger.info(f"Received GitLab webhook: {event_type}")
+    
+    # Only process project creation events; skip reading the body for anything else
+    if event_type != 'Project Create Hook':
+        return jsonify({'status': 'ignored', 'message': f'Event {event_type} not processed'}), 200
+    
     # Verify token
     token = request.headers.get('X-Gitlab-Token', '')
     if not verify_gitlab_token(token):
         logger.warning("Invalid GitLab webhook token")
         return jsonify({'error': 'Invalid token'}), 401
     
-    event_type = request.headers.get('X-Gitlab-Event', '')
     payload = request.json
+    repo_info = extract_repo_info_gitlab(payload)
     
-    logger.info(f"Received GitLab webhook: {event_type}")
-    
-    # Only process project creation events
-    if event_type == 'Project Create Hook':
-        repo_info = extract_repo_info_gitlab(payload)
+    if repo_info and repo_info['name']:
+        logger.info(f"New project created: {repo_info['full_name']}")
         
-        if repo_info:
-            logger.info(f"New project created: {repo_info['full_name']}")
-            
-            # Trigger Jenkins job
-            success = trigger_jenkins_job(repo_info['name'], repo_info)
-            
-            if success:
-                return jsonify({
-                    'status': 'success',
-                    'message': f"Harness project creation triggered for {repo_info['name']}",
-                    'project_name': repo_info['name']
-                }), 200
-            else:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Failed to trigger Jenkins job'
-                }), 500
+        delivery_id = request.headers.get('X-Gitlab-Event-UUID', '')
+        if is_duplicate_delivery('gitlab', delivery_id):
+            logger.info(f"Duplicate GitLab delivery for {repo_info['full_name']}, skipping")
+            return jsonify({'status': 'duplicate', 'message': 'Delivery already processed'}), 200
+        
+        # Trigger Jenkins job in the background
+        EXECUTOR.submit(trigger_jenkins_job, repo_info['name'], repo_info, ('gitlab', delivery_id))
+        
+        return jsonify({
+            'status': 'queued',
+            'message': f"Harness project creation queued for {repo_info['name']}",
+            'project_name': repo_info['name']
+        }), 202
     
     return jsonify({'status': 'ignored', 'message': f'Event {event_type} not processed'}), 200
 
 
 @app.route('/webhook/manual', methods=['POST'])
 def manual_webhook():
-    """Manual webhook endpoint for testing or custom triggers"""
+    """Manual webhook endpoint for testing or custom triggers
+    
+    Unlike the GitHub/GitLab hooks this waits for Jenkins, so the caller sees the outcome.
+    """
     data = request.json
     
     project_name = data.get('project_name', '')